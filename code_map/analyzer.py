@@ -6,11 +6,11 @@ Lógica de análisis individual de archivos Python usando AST.
 from __future__ import annotations
 
 import ast
-import tokenize
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Iterable, List, Optional, Union
 
+from .ast_utils import parse_file
 from .models import AnalysisError, FileSummary, SymbolInfo, SymbolKind
 
 
@@ -84,8 +84,7 @@ class FileAnalyzer:
         """
         abs_path = Path(path).resolve()
         try:
-            source = self._read_source(abs_path)
-            tree = ast.parse(source, filename=str(abs_path))
+            tree = parse_file(abs_path)
         except SyntaxError as exc:  # análisis continúa pese a errores
             error = AnalysisError(
                 message=str(exc.msg),
@@ -117,34 +116,6 @@ class FileAnalyzer:
             modified_at=get_modified_time(abs_path),
         )
 
-    def _read_source(self, path: Path) -> str:
-        """
-        Lee el archivo detectando la codificación declarada.
-
-        Utiliza tokenize.detect_encoding() para respetar las declaraciones de
-        codificación en el archivo (PEP 263: # -*- coding: utf-8 -*-).
-
-        Args:
-            path (Path): Ruta al archivo a leer
-
-        Returns:
-            str: Contenido completo del archivo decodificado
-
-        Raises:
-            UnicodeDecodeError: Si la codificación detectada es incorrecta
-            OSError: Si el archivo no puede ser leído
-
-        Notes:
-            - Respeta declaraciones de encoding en la primera o segunda línea
-            - Fallback a UTF-8 si no hay declaración explícita
-            - Abre en modo binario para detección correcta
-        """
-        with path.open("rb") as buffer:
-            encoding, _ = tokenize.detect_encoding(buffer.readline)
-            buffer.seek(0)
-            data = buffer.read()
-        return data.decode(encoding)
-
     def _build_function_symbol(self, node: AstFunction, path: Path) -> SymbolInfo:
         """
         Crea la representación de símbolo para una función o corrutina.
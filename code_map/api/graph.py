@@ -5,12 +5,13 @@ Endpoints relacionados con visualizaciones de grafos.
 
 from __future__ import annotations
 
+import asyncio
 from typing import List, Optional, Set
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response
 
 from ..class_graph import build_class_graph
-from ..uml_graph import GraphvizStyleOptions, build_uml_model, render_uml_svg
+from ..uml_graph import GraphvizStyleOptions, render_uml_svg
 from ..state import AppState
 from .deps import get_app_state
 from .schemas import ClassGraphResponse, UMLDiagramResponse
@@ -198,8 +199,8 @@ async def get_uml_diagram(
     else:
         requested_types = {"inheritance", "association"}
 
-    uml = build_uml_model(
-        state.settings.root_path,
+    uml = await asyncio.to_thread(
+        state.build_uml,
         module_prefixes=prefixes,
         include_external=include_external,
     )
@@ -234,8 +235,8 @@ async def get_uml_svg(
     else:
         requested_types = {"inheritance", "association"}
 
-    model = build_uml_model(
-        state.settings.root_path,
+    model = await asyncio.to_thread(
+        state.build_uml,
         module_prefixes=prefixes,
         include_external=include_external,
     )
@@ -3,11 +3,39 @@
 Shared AST utilities for code analysis.
 
 This module provides common functionality for analyzing Python AST nodes,
-particularly for import resolution and module path handling.
+particularly for file parsing, import resolution and module path handling.
 """
 
 from __future__ import annotations
 
+import ast
+import os
+from pathlib import Path
+from typing import Optional
+
+
+def parse_file(path: Path, source: Optional[bytes] = None) -> ast.Module:
+    """
+    Parse a Python file from its bytes.
+
+    Parsing bytes (not decoded text) honours a BOM and PEP 263 encoding
+    declarations.
+
+    Args:
+        path: Path of the Python file.
+        source: Optional bytes already read from the file.
+
+    Raises:
+        OSError: If the file cannot be read.
+        SyntaxError: If the code is invalid (including bad encodings).
+        ValueError: If the code contains null bytes.
+    """
+    filename = os.fspath(path)
+    if source is None:
+        with open(filename, "rb") as handle:
+            source = handle.read()
+    return ast.parse(source, filename=filename)
+
 
 class ImportResolver:
     """Shared logic for resolving Python imports in AST analysis."""
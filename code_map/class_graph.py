@@ -18,7 +18,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Set, Tuple
 
-from .ast_utils import ImportResolver
+from .ast_utils import ImportResolver, parse_file
 
 # ---------------------------------------------------------------------------
 # Modelos de datos
@@ -352,11 +352,11 @@ def _analyze_modules(root: Path) -> Iterable[ModuleInfo]:
 
         try:
             module = _module_name_from_path(root, path)
-            tree = ast.parse(path.read_text(encoding="utf-8"))
+            tree = parse_file(path)
             analyzer = ModuleAnalyzer(module=module, file_path=path)
             analyzer.visit(tree)
             yield analyzer.info
-        except (OSError, SyntaxError):
+        except (OSError, SyntaxError, ValueError):
             continue
 
 
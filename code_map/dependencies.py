@@ -130,6 +130,11 @@ OPTIONAL_DEPENDENCIES: Tuple[DependencySpec, ...] = (
         modules=("bs4",),
         description="Extracción de elementos HTML",
     ),
+    DependencySpec(
+        key="pygraphviz",
+        modules=("pygraphviz",),
+        description="Renderizado UML en proceso con Graphviz",
+    ),
 )
 
 optional_dependencies = OptionalDependencyRegistry(OPTIONAL_DEPENDENCIES)
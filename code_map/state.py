@@ -18,6 +18,7 @@ from .cache import SnapshotStore
 from .index import SymbolIndex
 from .scanner import ProjectScanner
 from .scheduler import ChangeScheduler
+from .uml_graph import UMLModelIndex, build_uml_model
 from .watcher import WatcherService
 from .settings import AppSettings, save_settings, ENV_DISABLE_LINTERS, ENV_CACHE_DIR
 from .linters import (
@@ -78,6 +79,7 @@ class AppState:
     last_full_scan: Optional[datetime] = field(init=False, default=None)
     last_event_batch: Optional[datetime] = field(init=False, default=None)
     reporter: StateReporter = field(init=False)
+    uml_index: UMLModelIndex = field(init=False)
 
     def __post_init__(self) -> None:
         self.event_queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
@@ -189,6 +191,7 @@ class AppState:
                     persist=True,
                     store=self.snapshot_store,
                 )
+                await asyncio.to_thread(self.uml_index.apply_change_batch, batch)
                 payload = self._serialize_changes(changes)
                 if payload["updated"] or payload["deleted"]:
                     self.last_event_batch = datetime.now(timezone.utc)
@@ -210,6 +213,8 @@ class AppState:
 
     async def perform_full_scan(self) -> int:
         """Realiza un escaneo completo del proyecto."""
+        # El modelo UML se recarga perezosamente en la próxima petición.
+        self.uml_index = UMLModelIndex(self.settings.root_path)
         summaries = await asyncio.to_thread(
             self.scanner.scan_and_update_index,
             self.index,
@@ -553,6 +558,29 @@ class AppState:
         """Comprueba si el observador de archivos está en ejecución."""
         return bool(self.watcher and self.watcher.is_running)
 
+    def build_uml(
+        self,
+        *,
+        module_prefixes: Optional[Set[str]] = None,
+        include_external: bool = False,
+    ) -> Dict[str, object]:
+        """
+        Construye el modelo UML (bloqueante: llamar desde un hilo).
+
+        El índice incremental solo se mantiene al día con los lotes del watcher;
+        sin watcher activo se reconstruye el modelo completo en cada petición.
+        """
+        if self.is_watcher_running():
+            return self.uml_index.build(
+                module_prefixes=module_prefixes,
+                include_external=include_external,
+            )
+        return build_uml_model(
+            self.settings.root_path,
+            module_prefixes=module_prefixes,
+            include_external=include_external,
+        )
+
     def get_settings_payload(self) -> Dict[str, Any]:
         """Obtiene el payload de configuración para la API."""
         return self.reporter.settings_payload(watcher_active=self.is_watcher_running())
@@ -670,6 +698,7 @@ class AppState:
             scanner=self.scanner,
             index=self.index,
         )
+        self.uml_index = UMLModelIndex(self.settings.root_path)
         self.watcher = WatcherService(
             self.settings.root_path,
             self.scheduler,
@@ -4,14 +4,85 @@
 from __future__ import annotations
 
 import ast
+import hashlib
 import html
+import json
+import os
 import shutil
 import subprocess  # nosec B404 - se invoca Graphviz 'dot' de forma controlada
+import threading
 from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Set
+from typing import AbstractSet, Any, Dict, Iterable, Iterator, List, Optional, Set
 
 from .ast_utils import ImportResolver
+from .constants import META_DIR_NAME
+from .dependencies import optional_dependencies
+from .events import ChangeBatch
+from .scanner import DEFAULT_EXCLUDED_DIRS
+from .settings import ENV_CACHE_DIR
+
+# Module-level aliases for the node classes checked in hot isinstance() calls:
+# a single global lookup instead of resolving ``ast`` and then the attribute.
+_Name = ast.Name
+_Attr = ast.Attribute
+_Sub = ast.Subscript
+_Const = ast.Constant
+_Tuple = ast.Tuple
+_BinOp = ast.BinOp
+_BitOr = ast.BitOr
+_Call = ast.Call
+_ClassDef = ast.ClassDef
+_FunctionDef = ast.FunctionDef
+_Import = ast.Import
+_ImportFrom = ast.ImportFrom
+_AnnAssign = ast.AnnAssign
+_Assign = ast.Assign
+
+# Module-level statements whose nested bodies may still hold imports/classes.
+_COMPOUND_STATEMENTS = tuple(
+    getattr(ast, name)
+    for name in (
+        "If",
+        "For",
+        "AsyncFor",
+        "While",
+        "Try",
+        "TryStar",
+        "With",
+        "AsyncWith",
+        "Match",
+    )
+    if hasattr(ast, name)
+)
+
+# Typing constructs that look like classes but never produce UML references.
+_BUILTIN_TYPE_NAMES = frozenset(
+    {
+        "List",
+        "Dict",
+        "Set",
+        "Tuple",
+        "Optional",
+        "Union",
+        "Any",
+        "Callable",
+        "Type",
+        "Sequence",
+        "Iterable",
+    }
+)
+
+# Directories never worth parsing for class diagrams (build output, vendored deps).
+_EXCLUDED_DIRS = frozenset(DEFAULT_EXCLUDED_DIRS | {".next", "dist", "build"})
+
+# Per-file analysis cache (``<cache>/uml/<digest>.json``). Bump the version when
+# the analyzer output changes so stale entries stop matching.
+_CACHE_VERSION = 2
+_CACHE_SUBDIR = "uml"
+_CACHE_MAX_ENTRIES = 4096
 
 
 @dataclass
@@ -36,7 +107,7 @@ class ClassModel:
     bases: List[str] = field(default_factory=list)
     attributes: List[AttributeInfo] = field(default_factory=list)
     methods: List[MethodInfo] = field(default_factory=list)
-    associations: Set[str] = field(default_factory=set)
+    associations: List[str] = field(default_factory=list)
     instantiates: Set[str] = field(
         default_factory=set
     )  # Classes created via SomeClass()
@@ -92,20 +163,47 @@ class GraphvizStyleOptions:
     reference_style: str = "dotted"
 
 
-class UMLModuleAnalyzer(ast.NodeVisitor):
+class UMLModuleAnalyzer:
+    """Collect imports and class models from a parsed module.
+
+    Traversal is explicit instead of ``ast.NodeVisitor``-based: outside of
+    classes only statement bodies are followed (imports and classes cannot
+    live inside expressions), and members are read from the class body.
+    """
+
     def __init__(self, module: str, file_path: Path) -> None:
         self.module = module
         self.file_path = file_path
         self.model = ModuleModel(name=module, file=file_path)
         self._current_class: Optional[ClassModel] = None
 
-    def visit_Import(self, node: ast.Import) -> None:
+    def analyze(self, tree: ast.Module) -> ModuleModel:
+        self._visit_statements(tree.body)
+        return self.model
+
+    def _visit_statements(self, body: List[ast.stmt]) -> None:
+        for node in body:
+            if isinstance(node, _ClassDef):
+                self._visit_class(node)
+            elif isinstance(node, _Import):
+                self._visit_import(node)
+            elif isinstance(node, _ImportFrom):
+                self._visit_import_from(node)
+            elif isinstance(node, _COMPOUND_STATEMENTS):
+                # if/try/with/for blocks: TYPE_CHECKING imports, optional deps...
+                for field_name in ("body", "orelse", "finalbody"):
+                    self._visit_statements(getattr(node, field_name, None) or [])
+                for nested in getattr(node, "handlers", ()):
+                    self._visit_statements(nested.body)
+                for case in getattr(node, "cases", ()):
+                    self._visit_statements(case.body)
+
+    def _visit_import(self, node: ast.Import) -> None:
         for alias in node.names:
             key = alias.asname or alias.name.split(".")[0]
             self.model.imports[key] = alias.name
-        self.generic_visit(node)
 
-    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+    def _visit_import_from(self, node: ast.ImportFrom) -> None:
         module = node.module or ""
         for alias in node.names:
             if alias.name == "*":
@@ -114,13 +212,12 @@ class UMLModuleAnalyzer(ast.NodeVisitor):
             base = self._resolve_relative(module, node.level)
             full = f"{base}.{alias.name}" if base else alias.name
             self.model.imports[key] = full
-        self.generic_visit(node)
 
     def _resolve_relative(self, module: str, level: int) -> str:
         """Resolve relative imports to absolute module paths."""
         return ImportResolver.resolve_relative_import(self.module, module, level)
 
-    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+    def _visit_class(self, node: ast.ClassDef) -> None:
         model = ClassModel(
             name=node.name,
             module=self.module,
@@ -135,10 +232,31 @@ class UMLModuleAnalyzer(ast.NodeVisitor):
         self.model.classes[node.name] = model
         previous = self._current_class
         self._current_class = model
-        self.generic_visit(node)
+        for member in node.body:
+            if isinstance(member, _FunctionDef):
+                self._visit_method(member)
+            elif isinstance(member, _AnnAssign):
+                self._visit_ann_assign(member)
+            elif isinstance(member, _Assign):
+                self._visit_assign(member)
+        self._scan_class_subtree(node)
         self._current_class = previous
 
-    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+    def _scan_class_subtree(self, node: ast.AST) -> None:
+        """Record instantiations and imports; nested classes get their own model."""
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, _ClassDef):
+                self._visit_class(child)
+                continue
+            if isinstance(child, _Call):
+                self._visit_call(child)
+            elif isinstance(child, _Import):
+                self._visit_import(child)
+            elif isinstance(child, _ImportFrom):
+                self._visit_import_from(child)
+            self._scan_class_subtree(child)
+
+    def _visit_method(self, node: ast.FunctionDef) -> None:
         if self._current_class is None:
             return
         params = [arg.arg for arg in node.args.args]
@@ -148,22 +266,19 @@ class UMLModuleAnalyzer(ast.NodeVisitor):
         self._current_class.methods.append(
             MethodInfo(name=node.name, parameters=params, returns=returns)
         )
-        self.generic_visit(node)
 
-    def visit_Call(self, node: ast.Call) -> None:
+    def _visit_call(self, node: ast.Call) -> None:
         """Detect class instantiation: instance = SomeClass()"""
         if self._current_class is None:
-            self.generic_visit(node)
             return
         target = self._expr_to_name(node.func)
         if target and target[0].isupper():  # Likely a class (PascalCase)
             self._current_class.instantiates.add(target)
-        self.generic_visit(node)
 
-    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+    def _visit_ann_assign(self, node: ast.AnnAssign) -> None:
         if self._current_class is None:
             return
-        if isinstance(node.target, ast.Name):
+        if isinstance(node.target, _Name):
             annotation = self._expr_to_name(node.annotation)
             optional = _is_optional(node.annotation)
             self._current_class.attributes.append(
@@ -176,136 +291,223 @@ class UMLModuleAnalyzer(ast.NodeVisitor):
             # Track type hints as references
             type_names = self._extract_type_names(node.annotation)
             self._current_class.references.update(type_names)
-        self.generic_visit(node)
 
-    def visit_Assign(self, node: ast.Assign) -> None:
+    def _visit_assign(self, node: ast.Assign) -> None:
         if self._current_class is None:
             return
         for target in node.targets:
-            if isinstance(target, ast.Name):
+            if isinstance(target, _Name):
                 self._current_class.attributes.append(AttributeInfo(name=target.id))
-        if isinstance(node.value, ast.Call):
+        if isinstance(node.value, _Call):
             func_name = self._expr_to_name(node.value.func)
             if func_name:
                 lower = func_name.lower()
                 if "relationship" in lower and node.value.args:
                     arg = node.value.args[0]
                     ref = None
-                    if isinstance(arg, ast.Constant) and isinstance(arg.value, str):
+                    if isinstance(arg, _Const) and isinstance(arg.value, str):
                         ref = arg.value
                     else:
                         ref = self._expr_to_name(arg)
                     if ref:
                         self._track_association(ref)
-        self.generic_visit(node)
 
     def _track_association(self, raw: str) -> None:
         if self._current_class is None:
             return
         name = raw.split("[")[0]
-        if name:
-            self._current_class.associations.add(name)
+        if name and name not in self._current_class.associations:
+            self._current_class.associations.append(name)
 
     def _expr_to_name(self, expr: Optional[ast.AST]) -> Optional[str]:
         if expr is None:
             return None
-        if isinstance(expr, ast.Name):
+        if isinstance(expr, _Name):
             return expr.id
-        if isinstance(expr, ast.Attribute):
+        if isinstance(expr, _Attr):
             return ".".join(self._collect_attribute(expr))
-        if isinstance(expr, ast.Subscript):
+        if isinstance(expr, _Sub):
             return self._expr_to_name(expr.value)
-        if isinstance(expr, ast.Constant) and isinstance(expr.value, str):
+        if isinstance(expr, _Const) and isinstance(expr.value, str):
             return expr.value
         return None
 
     def _collect_attribute(self, node: ast.Attribute) -> List[str]:
         parts: List[str] = []
         current: ast.AST = node
-        while isinstance(current, ast.Attribute):
+        while isinstance(current, _Attr):
             parts.append(current.attr)
             current = current.value
-        if isinstance(current, ast.Name):
+        if isinstance(current, _Name):
             parts.append(current.id)
         return list(reversed(parts))
 
-    def _extract_type_names(self, node: Optional[ast.AST]) -> Set[str]:
-        """Extract all class names from type annotation (handles Union, List, Optional, etc.)"""
-        names: Set[str] = set()
+    def _extract_type_names(
+        self, node: Optional[ast.AST], names: Optional[List[str]] = None
+    ) -> List[str]:
+        """Extract all class names from type annotation (handles Union, List, Optional, etc.)
+
+        Typing built-ins are skipped as they are found. The result may contain
+        duplicates; callers merge it into a set.
+        """
+        if names is None:
+            names = []
         if node is None:
             return names
 
         # Simple name: foo: Bar
-        if isinstance(node, ast.Name):
-            if node.id[0].isupper():  # Likely a class (PascalCase)
-                names.add(node.id)
+        if isinstance(node, _Name):
+            # Likely a class (PascalCase)
+            if node.id[0].isupper() and node.id not in _BUILTIN_TYPE_NAMES:
+                names.append(node.id)
 
         # Subscript: List[User], Optional[Product]
-        elif isinstance(node, ast.Subscript):
+        elif isinstance(node, _Sub):
             # Recurse into base and slice
-            names.update(self._extract_type_names(node.value))
-            names.update(self._extract_type_names(node.slice))
+            self._extract_type_names(node.value, names)
+            self._extract_type_names(node.slice, names)
 
         # Tuple of types: Union[A, B] or tuple annotation
-        elif isinstance(node, ast.Tuple):
+        elif isinstance(node, _Tuple):
             for elt in node.elts:
-                names.update(self._extract_type_names(elt))
+                self._extract_type_names(elt, names)
 
         # Binary or: A | B (Python 3.10+)
-        elif isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
-            names.update(self._extract_type_names(node.left))
-            names.update(self._extract_type_names(node.right))
+        elif isinstance(node, _BinOp) and isinstance(node.op, _BitOr):
+            self._extract_type_names(node.left, names)
+            self._extract_type_names(node.right, names)
 
         # Attribute: module.ClassName
-        elif isinstance(node, ast.Attribute):
+        elif isinstance(node, _Attr):
             attr_name = self._expr_to_name(node)
-            if attr_name and attr_name[0].isupper():
-                names.add(attr_name)
+            if (
+                attr_name
+                and attr_name[0].isupper()
+                and attr_name not in _BUILTIN_TYPE_NAMES
+            ):
+                names.append(attr_name)
 
         # String literal (forward reference)
-        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
-            if node.value and node.value[0].isupper():
-                names.add(node.value)
-
-        # Filter out built-in types
-        builtin_types = {
-            "List",
-            "Dict",
-            "Set",
-            "Tuple",
-            "Optional",
-            "Union",
-            "Any",
-            "Callable",
-            "Type",
-            "Sequence",
-            "Iterable",
-        }
-        return {name for name in names if name not in builtin_types}
+        elif isinstance(node, _Const) and isinstance(node.value, str):
+            value = node.value
+            if value and value[0].isupper() and value not in _BUILTIN_TYPE_NAMES:
+                names.append(value)
+
+        return names
 
 
 def _is_optional(expr: Optional[ast.AST]) -> bool:
     if expr is None:
         return False
-    if isinstance(expr, ast.Subscript):
+    if isinstance(expr, _Sub):
         base = expr.value
-        if isinstance(base, ast.Name) and base.id in {"Optional", "Union"}:
+        if isinstance(base, _Name) and base.id in {"Optional", "Union"}:
             return True
-    if isinstance(expr, ast.BinOp) and isinstance(expr.op, ast.BitOr):
+    if isinstance(expr, _BinOp) and isinstance(expr.op, _BitOr):
         return True
     return False
 
 
+class UMLModelIndex:
+    """Keeps parsed modules alive between requests for incremental UML builds.
+
+    The first ``build`` scans the whole tree; afterwards watcher batches passed
+    to ``apply_change_batch`` only re-analyze the files that changed.
+    """
+
+    def __init__(self, root: Path, *, use_cache: bool = True) -> None:
+        self.root = Path(root).expanduser().resolve()
+        self._cache_dir = _default_cache_dir(self.root) if use_cache else None
+        self._modules: Dict[Path, ModuleModel] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def build(
+        self,
+        *,
+        module_prefixes: Optional[Set[str]] = None,
+        include_external: bool = False,
+    ) -> Dict[str, object]:
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            modules = list(self._modules.values())
+        return _assemble_model(modules, module_prefixes, include_external)
+
+    def apply_change_batch(self, batch: ChangeBatch) -> bool:
+        """Re-analyze changed files; returns True if the cached modules changed."""
+        removed = list(batch.deleted)
+        changed = list(batch.created) + list(batch.modified)
+        for src, dest in batch.moved:
+            removed.append(src)
+            changed.append(dest)
+
+        with self._lock:
+            if not self._loaded:
+                return False  # next build() performs the full scan anyway
+            touched = False
+            for path in removed:
+                touched |= self._modules.pop(Path(path), None) is not None
+            sources: List[Path] = []
+            for raw in changed:
+                path = Path(raw)
+                if self._is_source(path):
+                    sources.append(path)
+                else:
+                    touched |= self._modules.pop(path, None) is not None
+            for path, model in zip(sources, self._analyze_paths(sources)):
+                if model is not None:
+                    self._modules[path] = model
+                    touched = True
+                else:
+                    touched |= self._modules.pop(path, None) is not None
+            return touched
+
+    def _analyze_paths(self, paths: List[Path]) -> List[Optional[ModuleModel]]:
+        # In-process even for bulk changes (checkouts, formatters): starting
+        # worker processes costs more than re-parsing the batch.
+        return [_analyze_one(self.root, path, self._cache_dir) for path in paths]
+
+    def _load(self) -> None:
+        self._modules = {
+            model.file: model
+            for model in _analyze(self.root, cache_dir=self._cache_dir)
+        }
+        self._loaded = True
+
+    def _is_source(self, path: Path) -> bool:
+        if path.suffix != ".py":
+            return False
+        try:
+            parts = path.relative_to(self.root).parts
+        except ValueError:
+            return False
+        return not any(part in _EXCLUDED_DIRS for part in parts)
+
+
 def build_uml_model(
     root: Path,
     *,
     module_prefixes: Optional[Set[str]] = None,
     include_external: bool = False,
+    use_cache: bool = True,
 ) -> Dict[str, object]:
     root = root.expanduser().resolve()
-    modules = list(_analyze(root))
+    cache_dir = _default_cache_dir(root) if use_cache else None
+    modules = list(_analyze(root, cache_dir=cache_dir))
+    return _assemble_model(modules, module_prefixes, include_external)
+
+
+def _assemble_model(
+    modules: List[ModuleModel],
+    module_prefixes: Optional[Set[str]],
+    include_external: bool,
+) -> Dict[str, object]:
+    """Resolve relationships between analyzed modules into the API payload."""
     modules = _filter_modules(modules, module_prefixes)
     index = _collect_definitions(modules)
+    # The resolvers only test membership; keep the class models out of the loop.
+    known = frozenset(index)
 
     classes = []
     inheritance_edges = 0
@@ -314,16 +516,21 @@ def build_uml_model(
     reference_edges = 0
 
     for module in modules:
+        # The same raw names (List, Path, sibling classes...) recur across every
+        # class of a module; resolve each one once per module.
+        resolved: Dict[str, Optional[str]] = {}
         for class_model in module.classes.values():
-            bases = _resolve_bases(class_model, module, index, include_external)
+            bases = _resolve_bases(
+                class_model, module, known, include_external, resolved
+            )
             associations = _resolve_associations(
-                class_model, module, index, include_external
+                class_model, module, known, include_external, resolved
             )
             instantiates = _resolve_references(
-                class_model.instantiates, module, index, include_external
+                class_model.instantiates, module, known, include_external, resolved
             )
             references = _resolve_references(
-                class_model.references, module, index, include_external
+                class_model.references, module, known, include_external, resolved
             )
 
             inheritance_edges += len(bases)
@@ -415,6 +622,43 @@ def build_uml_dot(
         + f'", fontsize={options.edge_fontsize}, color="{_quote_attr(options.edge_color)}", penwidth={_format_float(options.edge_penwidth)}];',
     ]
 
+    # Edge attributes only depend on the options: build each suffix once.
+    penwidth = _format_float(options.edge_penwidth)
+    inheritance_suffix = (
+        ' [style="'
+        + _quote_attr(options.inheritance_style)
+        + '", arrowhead="'
+        + _quote_attr(options.inheritance_arrowhead)
+        + '", penwidth='
+        + penwidth
+        + f', color="{_quote_attr(options.inheritance_color)}"];'
+    )
+    association_suffix = (
+        ' [style="'
+        + _quote_attr(options.association_style)
+        + '", penwidth='
+        + penwidth
+        + f', color="{_quote_attr(options.association_color)}", arrowhead="{_quote_attr(options.association_arrowhead)}"];'
+    )
+    instantiation_suffix = (
+        ' [style="'
+        + _quote_attr(options.instantiation_style)
+        + '", penwidth='
+        + penwidth
+        + f', color="{_quote_attr(options.instantiation_color)}", arrowhead="{_quote_attr(options.instantiation_arrowhead)}"];'
+    )
+    reference_suffix = (
+        ' [style="'
+        + _quote_attr(options.reference_style)
+        + '", penwidth='
+        + penwidth
+        + f', color="{_quote_attr(options.reference_color)}", arrowhead="{_quote_attr(options.reference_arrowhead)}"];'
+    )
+    show_inheritance = "inheritance" in edge_types
+    show_association = "association" in edge_types
+    show_instantiation = "instantiation" in edge_types
+    show_reference = "reference" in edge_types
+
     # Add nodes
     for cls in classes:
         node_id = _escape_id(cls["id"])
@@ -426,69 +670,31 @@ def build_uml_dot(
         source = _escape_id(cls["id"])
 
         # Inheritance (blue, solid, empty arrow)
-        if "inheritance" in edge_types:
+        if show_inheritance:
             for base in cls.get("bases", []):
-                target = _escape_id(base)
                 lines.append(
-                    "  "
-                    + target
-                    + " -> "
-                    + source
-                    + ' [style="'
-                    + _quote_attr(options.inheritance_style)
-                    + '", arrowhead="'
-                    + _quote_attr(options.inheritance_arrowhead)
-                    + '", penwidth='
-                    + _format_float(options.edge_penwidth)
-                    + f', color="{_quote_attr(options.inheritance_color)}"];'
+                    "  " + _escape_id(base) + " -> " + source + inheritance_suffix
                 )
 
         # Association (orange, dashed, normal arrow)
-        if "association" in edge_types:
+        if show_association:
             for assoc in cls.get("associations", []):
-                target = _escape_id(assoc)
                 lines.append(
-                    "  "
-                    + source
-                    + " -> "
-                    + target
-                    + ' [style="'
-                    + _quote_attr(options.association_style)
-                    + '", penwidth='
-                    + _format_float(options.edge_penwidth)
-                    + f', color="{_quote_attr(options.association_color)}", arrowhead="{_quote_attr(options.association_arrowhead)}"];'
+                    "  " + source + " -> " + _escape_id(assoc) + association_suffix
                 )
 
         # Instantiation (green, dashed, diamond arrow)
-        if "instantiation" in edge_types:
+        if show_instantiation:
             for inst in cls.get("instantiates", []):
-                target = _escape_id(inst)
                 lines.append(
-                    "  "
-                    + source
-                    + " -> "
-                    + target
-                    + ' [style="'
-                    + _quote_attr(options.instantiation_style)
-                    + '", penwidth='
-                    + _format_float(options.edge_penwidth)
-                    + f', color="{_quote_attr(options.instantiation_color)}", arrowhead="{_quote_attr(options.instantiation_arrowhead)}"];'
+                    "  " + source + " -> " + _escape_id(inst) + instantiation_suffix
                 )
 
         # Reference (purple, dotted, vee arrow)
-        if "reference" in edge_types:
+        if show_reference:
             for ref in cls.get("references", []):
-                target = _escape_id(ref)
                 lines.append(
-                    "  "
-                    + source
-                    + " -> "
-                    + target
-                    + ' [style="'
-                    + _quote_attr(options.reference_style)
-                    + '", penwidth='
-                    + _format_float(options.edge_penwidth)
-                    + f', color="{_quote_attr(options.reference_color)}", arrowhead="{_quote_attr(options.reference_arrowhead)}"];'
+                    "  " + source + " -> " + _escape_id(ref) + reference_suffix
                 )
 
     lines.append("}")
@@ -510,6 +716,21 @@ def render_uml_svg(
     options = _prepare_graphviz_options(graphviz)
     dot = build_uml_dot(model, edge_types, options)
     engine = options.layout_engine or "dot"
+
+    # Prefer libgvc in-process (no fork/exec per render); fall back to the CLI.
+    pygraphviz = optional_dependencies.require("pygraphviz")
+    if pygraphviz is not None:
+        try:
+            svg = pygraphviz.AGraph(string=dot).draw(format="svg", prog=engine)
+        except Exception:  # pragma: no cover - defer to the dot binary below
+            svg = None
+        if svg:
+            return svg.decode("utf-8")
+
+    return _render_with_dot_binary(dot, engine)
+
+
+def _render_with_dot_binary(dot: str, engine: str) -> str:
     dot_binary = shutil.which(engine)
     if not dot_binary:
         dot_binary = shutil.which("dot")
@@ -664,49 +885,187 @@ def _quote_attr(value: str) -> str:
 
 
 def _analyze(
-    root: Path, excluded_dirs: Optional[Set[str]] = None
+    root: Path,
+    excluded_dirs: Optional[AbstractSet[str]] = None,
+    cache_dir: Optional[Path] = None,
 ) -> Iterable[ModuleModel]:
     """Analyze Python files in the root directory, excluding certain directories.
 
     Args:
         root: Root directory to scan
         excluded_dirs: Set of directory names to exclude (e.g., .venv, __pycache__)
+        cache_dir: Directory for the per-file content-hash cache (None disables it)
     """
     if excluded_dirs is None:
-        excluded_dirs = {
-            "__pycache__",
-            ".git",
-            ".hg",
-            ".mypy_cache",
-            ".pytest_cache",
-            ".ruff_cache",
-            ".svn",
-            ".tox",
-            ".venv",
-            "venv",
-            "env",
-            ".code-map",
-            "node_modules",
-            ".next",
-            "dist",
-            "build",
-        }
+        excluded_dirs = _EXCLUDED_DIRS
+
+    paths = list(_iter_py_files(root, excluded_dirs))
+
+    for model in map(_analyze_one, repeat(root), paths, repeat(cache_dir)):
+        if model is not None:
+            yield model
+
+    if cache_dir is not None:
+        _prune_cache(cache_dir)
 
-    for path in root.rglob("*.py"):
-        # Check if any part of the path is in excluded_dirs
-        if any(part in excluded_dirs for part in path.relative_to(root).parts):
+
+def _iter_py_files(root: Path, excluded_dirs: AbstractSet[str]) -> Iterator[Path]:
+    """Yield ``*.py`` files under ``root`` without descending into excluded dirs."""
+    pending = [str(root)]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name in excluded_dirs:
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif name.endswith(".py") and entry.is_file():
+                            yield Path(entry.path)
+                    except OSError:  # pragma: no cover - entry vanished mid-walk
+                        continue
+        except OSError:  # pragma: no cover - unreadable directory
             continue
 
+
+def _analyze_one(
+    root: Path, path: Path, cache_dir: Optional[Path] = None
+) -> Optional[ModuleModel]:
+    """Parse a single file into a ``ModuleModel``."""
+    try:
+        module = ".".join(path.relative_to(root).with_suffix("").parts)
+        data = path.read_bytes()
+    except OSError:  # pragma: no cover
+        return None
+
+    cache_path: Optional[Path] = None
+    if cache_dir is not None:
+        cache_path = cache_dir / f"{_cache_key(module, data)}.json"
+        cached = _load_cached_module(cache_path, path)
+        if cached is not None:
+            return cached
+
+    try:
+        # Bytes keep PEP 263 encoding declarations working.
+        tree = ast.parse(data, filename=str(path))
+    except (SyntaxError, ValueError):  # pragma: no cover
+        return None
+    model = UMLModuleAnalyzer(module, path).analyze(tree)
+
+    if cache_path is not None:
+        _store_cached_module(cache_path, model)
+    return model
+
+
+def _default_cache_dir(root: Path) -> Path:
+    """Cache location, honouring ``CODE_MAP_CACHE_DIR`` like the snapshot store."""
+    override = os.getenv(ENV_CACHE_DIR)
+    base = Path(override).expanduser() if override else root / META_DIR_NAME
+    return base / _CACHE_SUBDIR
+
+
+def _cache_key(module: str, data: bytes) -> str:
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(f"{_CACHE_VERSION}:{module}\0".encode("utf-8"))
+    hasher.update(data)
+    return hasher.hexdigest()
+
+
+def _load_cached_module(cache_path: Path, path: Path) -> Optional[ModuleModel]:
+    try:
+        payload = json.loads(cache_path.read_text(encoding="utf-8"))
+        model = _module_from_dict(payload, path)
+        # Refresh mtime so the LRU sweep keeps entries that are still in use.
+        os.utime(cache_path)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return model
+
+
+def _store_cached_module(cache_path: Path, model: ModuleModel) -> None:
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(json.dumps(_module_to_dict(model)), encoding="utf-8")
+        os.replace(tmp_path, cache_path)
+    except OSError:  # pragma: no cover - read-only mounts just skip caching
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+
+def _prune_cache(cache_dir: Path, max_entries: int = _CACHE_MAX_ENTRIES) -> None:
+    """Drop the least recently used cache entries beyond ``max_entries``."""
+    try:
+        entries = [
+            (entry.stat().st_mtime, entry.path)
+            for entry in os.scandir(cache_dir)
+            if entry.name.endswith(".json")
+        ]
+    except OSError:
+        return
+    if len(entries) <= max_entries:
+        return
+    entries.sort()
+    for _, stale in entries[: len(entries) - max_entries]:
         try:
-            module = ".".join(path.relative_to(root).with_suffix("").parts)
-            tree = ast.parse(path.read_text(encoding="utf-8"))
-            analyzer = UMLModuleAnalyzer(module, path)
-            analyzer.visit(tree)
-            yield analyzer.model
-        except (SyntaxError, OSError):  # pragma: no cover
+            os.unlink(stale)
+        except OSError:  # pragma: no cover
             continue
 
 
+def _module_to_dict(model: ModuleModel) -> Dict[str, Any]:
+    return {
+        "name": model.name,
+        "imports": model.imports,
+        "classes": [
+            {
+                "name": cls.name,
+                "bases": cls.bases,
+                "attributes": [
+                    [attr.name, attr.annotation, attr.optional]
+                    for attr in cls.attributes
+                ],
+                "methods": [
+                    [method.name, method.parameters, method.returns]
+                    for method in cls.methods
+                ],
+                "associations": cls.associations,
+                "instantiates": sorted(cls.instantiates),
+                "references": sorted(cls.references),
+            }
+            for cls in model.classes.values()
+        ],
+    }
+
+
+def _module_from_dict(payload: Dict[str, Any], path: Path) -> ModuleModel:
+    module = ModuleModel(name=payload["name"], file=path, imports=payload["imports"])
+    for entry in payload["classes"]:
+        module.classes[entry["name"]] = ClassModel(
+            name=entry["name"],
+            module=module.name,
+            file=path,
+            bases=entry["bases"],
+            attributes=[
+                AttributeInfo(name=name, annotation=annotation, optional=optional)
+                for name, annotation, optional in entry["attributes"]
+            ],
+            methods=[
+                MethodInfo(name=name, parameters=parameters, returns=returns)
+                for name, parameters, returns in entry["methods"]
+            ],
+            associations=entry["associations"],
+            instantiates=set(entry["instantiates"]),
+            references=set(entry["references"]),
+        )
+    return module
+
+
 def _filter_modules(
     modules: List[ModuleModel], prefixes: Optional[Set[str]]
 ) -> List[ModuleModel]:
@@ -737,14 +1096,15 @@ def _collect_definitions(modules: Iterable[ModuleModel]) -> Dict[str, ClassModel
 def _resolve_bases(
     class_model: ClassModel,
     module: ModuleModel,
-    definitions: Dict[str, ClassModel],
+    definitions: AbstractSet[str],
     include_external: bool,
+    cache: Optional[Dict[str, Optional[str]]] = None,
 ) -> List[str]:
     bases: List[str] = []
     for base in class_model.bases:
         if not base:
             continue
-        target = _resolve_reference(base, module, definitions)
+        target = _resolve_reference(base, module, definitions, cache)
         if target or include_external:
             bases.append(target or base)
     return bases
@@ -753,14 +1113,15 @@ def _resolve_bases(
 def _resolve_associations(
     class_model: ClassModel,
     module: ModuleModel,
-    definitions: Dict[str, ClassModel],
+    definitions: AbstractSet[str],
     include_external: bool,
+    cache: Optional[Dict[str, Optional[str]]] = None,
 ) -> Set[str]:
     associations: Set[str] = set()
     for raw in class_model.associations:
         if not raw:
             continue
-        target = _resolve_reference(raw, module, definitions)
+        target = _resolve_reference(raw, module, definitions, cache)
         if target:
             associations.add(target)
         elif include_external:
@@ -771,15 +1132,16 @@ def _resolve_associations(
 def _resolve_references(
     raw_refs: Set[str],
     module: ModuleModel,
-    definitions: Dict[str, ClassModel],
+    definitions: AbstractSet[str],
     include_external: bool,
+    cache: Optional[Dict[str, Optional[str]]] = None,
 ) -> Set[str]:
     """Resolve a set of raw class names to fully qualified names."""
     resolved: Set[str] = set()
     for raw in raw_refs:
         if not raw:
             continue
-        target = _resolve_reference(raw, module, definitions)
+        target = _resolve_reference(raw, module, definitions, cache)
         if target:
             resolved.add(target)
         elif include_external:
@@ -788,41 +1150,42 @@ def _resolve_references(
 
 
 def _resolve_reference(
-    raw: str, module: ModuleModel, definitions: Dict[str, ClassModel]
+    raw: str,
+    module: ModuleModel,
+    definitions: AbstractSet[str],
+    cache: Optional[Dict[str, Optional[str]]] = None,
 ) -> Optional[str]:
-    for candidate in _possible_names(raw, module):
-        if candidate in definitions:
-            return candidate
-    return None
+    """Resolve ``raw`` within ``module``; ``cache`` must be scoped to that module."""
+    if cache is not None and raw in cache:
+        return cache[raw]
+    target = _first_definition(raw, module, definitions)
+    if cache is not None:
+        cache[raw] = target
+    return target
 
 
-def _possible_names(raw: str, module: ModuleModel) -> List[str]:
-    if raw is None:
-        return []
+def _first_definition(
+    raw: str, module: ModuleModel, definitions: AbstractSet[str]
+) -> Optional[str]:
+    """Probe candidate qualified names in priority order, stopping at the first hit."""
+    if not raw:
+        return None
     if not isinstance(raw, str):
         raw = str(raw)
-    if not raw:
-        return []
-    candidates: List[str] = []
-    if raw in module.classes:
-        candidates.append(f"{module.name}.{raw}")
-    if raw in module.imports:
-        candidates.append(module.imports[raw])
+    local = f"{module.name}.{raw}"
+    if raw in module.classes and local in definitions:
+        return local
+    imported = module.imports.get(raw)
+    if imported is not None and imported in definitions:
+        return imported
     if "." in raw:
         head, tail = raw.split(".", 1)
-        target = module.imports.get(head, head)
-        candidates.append(f"{target}.{tail}")
-    else:
-        candidates.append(f"{module.name}.{raw}")
-    seen: Set[str] = set()
-    unique: List[str] = []
-    for candidate in candidates:
-        if candidate not in seen:
-            unique.append(candidate)
-            seen.add(candidate)
-    return unique
+        candidate = f"{module.imports.get(head, head)}.{tail}"
+        return candidate if candidate in definitions else None
+    return local if local in definitions else None
 
 
+@lru_cache(maxsize=4096)
 def _escape_id(value: str) -> str:
     return '"' + value.replace('"', '\\"') + '"'
 
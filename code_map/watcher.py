@@ -6,8 +6,11 @@ Servicio de watcher basado en watchdog para detectar cambios en proyectos Python
 from __future__ import annotations
 
 import logging
+import os
+import re
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Iterable, Optional, Set, TYPE_CHECKING
+from typing import Any, Iterable, Optional, Set, Tuple, TYPE_CHECKING
 
 from .events import ChangeEventType
 from .scheduler import ChangeScheduler
@@ -55,6 +58,8 @@ EXCLUDED_DEFAULT: Set[str] = {
     "venv",
 }
 
+MTIME_CACHE_SIZE = 4096
+
 
 class _EventHandler(FileSystemEventHandler):
     """Encapsula la conversión de eventos watchdog a ChangeEventType."""
@@ -71,6 +76,14 @@ class _EventHandler(FileSystemEventHandler):
         self.scheduler = scheduler
         self.exclude_dirs = exclude_dirs
         self.extensions = extensions
+        # watchdog entrega rutas absolutas bajo la raíz programada (ya resuelta),
+        # así que basta con operaciones de cadena: sin stat() por evento.
+        self._root_prefix = os.path.join(str(root), "")
+        self._exclude_re = _compile_exclusions(exclude_dirs)
+        # Última firma (mtime, tamaño, inodo) despachada por ruta: los editores
+        # emiten varios MODIFIED por guardado y solo el primero aporta
+        # información nueva. Tamaño e inodo cubren mtimes de grano grueso.
+        self._last_mtime: "OrderedDict[str, Tuple[int, int, int]]" = OrderedDict()
 
     def on_created(self, event: FileSystemEvent) -> None:
         """Registra la creación de un archivo con extensión soportada."""
@@ -97,56 +110,86 @@ class _EventHandler(FileSystemEventHandler):
         if getattr(event, "is_directory", False):
             return
 
-        src_path = Path(getattr(event, "src_path", "")).resolve()
-        if not self._should_track(src_path):
+        src_path = self._normalize(getattr(event, "src_path", ""))
+        if not src_path or not self._should_track(src_path):
+            return
+
+        if not self._record_mtime(event_type, src_path):
             return
 
         if event_type is ChangeEventType.MOVED:
-            dest_path_raw = getattr(event, "dest_path", None)
-            dest_path = Path(dest_path_raw).resolve() if dest_path_raw else None
+            dest_path = self._normalize(getattr(event, "dest_path", None))
             if dest_path and not self._should_track(dest_path):
-                dest_path = None
+                dest_path = ""
             self.scheduler.enqueue(
                 ChangeEventType.MOVED,
-                src_path,
-                dest_path=dest_path,
+                Path(src_path),
+                dest_path=Path(dest_path) if dest_path else None,
             )
             return
 
-        self.scheduler.enqueue(event_type, src_path)
+        self.scheduler.enqueue(event_type, Path(src_path))
 
-    def _should_track(self, path: Path) -> bool:
-        """Determina si la ruta debe generar eventos de cambio."""
-        if not path.exists():
-            return path.suffix.lower() in self.extensions
+    def _record_mtime(self, event_type: ChangeEventType, path: str) -> bool:
+        """Actualiza la caché de firmas; False si el MODIFIED es un duplicado."""
+        if event_type in (ChangeEventType.DELETED, ChangeEventType.MOVED):
+            self._last_mtime.pop(path, None)
+            return True
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self._last_mtime.pop(path, None)
+            return True
+
+        signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        if (
+            event_type is ChangeEventType.MODIFIED
+            and self._last_mtime.get(path) == signature
+        ):
+            return False
 
+        self._last_mtime[path] = signature
+        self._last_mtime.move_to_end(path)
+        if len(self._last_mtime) > MTIME_CACHE_SIZE:
+            self._last_mtime.popitem(last=False)
+        return True
+
+    @staticmethod
+    def _normalize(raw: Any) -> str:
+        """Convierte la ruta del evento (str o bytes) a una cadena normalizada."""
+        if not raw:
+            return ""
+        return os.path.normpath(os.fsdecode(raw))
+
+    def _should_track(self, path: str) -> bool:
+        """Determina si la ruta debe generar eventos de cambio."""
         if not self._within_root(path):
             return False
 
-        if self._is_excluded(path):
+        if os.path.splitext(path)[1].lower() not in self.extensions:
             return False
 
-        if path.suffix.lower() not in self.extensions:
+        if self._is_excluded(path[len(self._root_prefix) :]):
             return False
 
         return True
 
-    def _within_root(self, path: Path) -> bool:
+    def _within_root(self, path: str) -> bool:
         """Comprueba si la ruta pertenece al árbol monitoreado."""
-        try:
-            path.resolve().relative_to(self.root)
-            return True
-        except ValueError:
-            return False
+        return path.startswith(self._root_prefix)
+
+    def _is_excluded(self, relative: str) -> bool:
+        """Verifica si alguna parte de la ruta relativa a la raíz está excluida."""
+        return self._exclude_re.search(relative) is not None
+
 
-    def _is_excluded(self, path: Path) -> bool:
-        """Verifica si alguna parte de la ruta está excluida."""
-        for part in path.parts:
-            if part in self.exclude_dirs:
-                return True
-            if part.startswith(".") and part != self.root.name:
-                return True
-        return False
+def _compile_exclusions(exclude_dirs: Iterable[str]) -> re.Pattern[str]:
+    """Compila un único patrón para los directorios excluidos y los ocultos."""
+    sep = re.escape(os.sep)
+    names = [re.escape(name) for name in sorted(exclude_dirs) if name]
+    names.append(rf"\.[^{sep}]*")
+    return re.compile(rf"(?:^|{sep})(?:{'|'.join(names)})(?:{sep}|$)")
 
 
 class WatcherService:
@@ -4,10 +4,15 @@ Shared configuration, thresholds, and helpers for stage detection logic.
 
 from __future__ import annotations
 
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import (
     Dict,
+    FrozenSet,
     Iterable,
     Iterator,
     List,
@@ -39,11 +44,16 @@ MANY_FILES_NO_PATTERNS_THRESHOLD = (
     30  # Many files without patterns suggests missing structure
 )
 
+# Line counting: read size, and when to spread files over a thread pool
+_LINE_COUNT_CHUNK = 1 << 16
+_LINE_COUNT_PARALLEL_MIN = 64
+_LINE_COUNT_MAX_WORKERS = 16
+
 # ---------------------------------------------------------------------------
 # Stage metadata
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StageThresholds:
     """Thresholds that describe boundaries for a project stage."""
 
@@ -53,7 +63,7 @@ class StageThresholds:
     max_arch_layers: Optional[int]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StageDefinition:
     """Declarative metadata for a stage."""
 
@@ -113,6 +123,11 @@ PATTERN_KEYWORDS: Dict[str, Tuple[str, ...]] = {
     "Middleware": ("middleware", "Middleware"),
 }
 
+_PATTERN_KEYWORDS_LOWER: Dict[str, Tuple[str, ...]] = {
+    pattern: tuple(dict.fromkeys(keyword.lower() for keyword in keywords))
+    for pattern, keywords in PATTERN_KEYWORDS.items()
+}
+
 ARCHITECTURE_FOLDERS: Tuple[str, ...] = (
     "models",
     "views",
@@ -161,6 +176,8 @@ IGNORE_DIRS: Set[str] = {
     ".qmake.stash",
 }
 
+_IGNORED_NAMES: FrozenSet[str] = frozenset(IGNORE_DIRS)
+
 DEFAULT_CODE_EXTENSIONS: Tuple[str, ...] = (
     ".py",
     ".js",
@@ -185,7 +202,7 @@ DEFAULT_CODE_EXTENSIONS: Tuple[str, ...] = (
 # Metrics and diagnostics
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StageMetrics:
     """Aggregated metrics used to evaluate which stage fits best."""
 
@@ -196,7 +213,7 @@ class StageMetrics:
     architectural_folders: List[str]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StageDiagnostics:
     """Additional data explaining how a stage recommendation was produced."""
 
@@ -204,7 +221,7 @@ class StageDiagnostics:
     warnings: Tuple[str, ...]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StageAssessment:
     """Final evaluation result with metrics and justification."""
 
@@ -222,7 +239,8 @@ class StageAssessment:
 def should_ignore(path: Path) -> bool:
     """Return True when any segment of the path is an ignored folder."""
 
-    return any(part.startswith(".") or part in IGNORE_DIRS for part in path.parts)
+    # Files share parents, so the directory check is cached per folder.
+    return _is_ignored_name(path.name) or _directory_ignored(str(path.parent))
 
 
 def collect_metrics(
@@ -250,15 +268,12 @@ def collect_metrics(
 
     unique_files = sorted(set(files))
     file_count = len(unique_files)
-    loc = sum(_count_file_lines(path) for path in unique_files)
+    loc = _count_lines(unique_files)
 
-    directories: Set[Path] = set()
-    for path in unique_files:
-        try:
-            path.relative_to(root)
-        except ValueError:
-            continue
-        directories.add(path.parent)
+    root_prefix = os.path.join(str(root), "")
+    directories: Set[Path] = {
+        path.parent for path in unique_files if str(path).startswith(root_prefix)
+    }
     directory_count = len(directories)
 
     patterns = detect_patterns(unique_files, root)
@@ -273,6 +288,36 @@ def collect_metrics(
     )
 
 
+def code_tree_signature(
+    root: Path,
+    *,
+    extensions: Sequence[str] = DEFAULT_CODE_EXTENSIONS,
+) -> str:
+    """
+    Fingerprint the code files `collect_metrics` would read.
+
+    Hashes each file's relative path, size and mtime: a stat-only walk that lets
+    callers reuse previously collected metrics while nothing has changed.
+    """
+
+    root = root.expanduser().resolve()
+    extension_set = {ext if ext.startswith(".") else f".{ext}" for ext in extensions}
+    entries = []
+    for path in set(_iter_code_files(root, extension_set)):
+        try:
+            stat_result = path.stat()
+        except OSError:
+            continue
+        relative = os.fspath(path.relative_to(root))
+        entries.append(f"{relative}\0{stat_result.st_size}\0{stat_result.st_mtime_ns}")
+
+    digest = hashlib.blake2b(digest_size=16)
+    for entry in sorted(entries):
+        digest.update(entry.encode("utf-8", "surrogateescape"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
 def evaluate_stage(metrics: StageMetrics) -> StageAssessment:
     """Evaluate the provided metrics and return a stage recommendation."""
 
@@ -298,20 +343,15 @@ def detect_patterns(files: Iterable[Path], root: Path) -> List[str]:
     """Detect design patterns using simple filename heuristics."""
 
     root = root.expanduser().resolve()
-    matches: Set[str] = set()
-
-    for pattern, keywords in PATTERN_KEYWORDS.items():
-        for keyword in keywords:
-            keyword_lower = keyword.lower()
-            if any(
-                keyword_lower in segment.lower()
-                for path in files
-                for segment in path.parts
-            ):
-                matches.add(pattern)
-                break
-
-    return sorted(matches)
+    # NUL-joined segments: one substring scan per keyword, no cross-segment hits.
+    segments = {segment.lower() for path in files for segment in path.parts}
+    haystack = "\0".join(segments)
+
+    return sorted(
+        pattern
+        for pattern, keywords in _PATTERN_KEYWORDS_LOWER.items()
+        if any(keyword in haystack for keyword in keywords)
+    )
 
 
 def detect_architectural_folders(root: Path, directories: Iterable[Path]) -> List[str]:
@@ -343,45 +383,73 @@ def _filter_summaries(
     extensions: Set[str],
 ) -> List["FileSummary"]:
     filtered: List["FileSummary"] = []
+    root_prefix = os.path.join(str(root), "")
     for summary in summaries:
         path = summary.path.resolve()
         if not path.suffix or path.suffix.lower() not in extensions:
             continue
-        try:
-            relative = path.relative_to(root)
-        except ValueError:
+        path_str = str(path)
+        if not path_str.startswith(root_prefix):
             # File is outside root; ignore it for stage heuristics
             continue
-        if should_ignore(relative):
+        if should_ignore(Path(path_str[len(root_prefix) :])):
             continue
         filtered.append(summary)
     return filtered
 
 
+def _is_ignored_name(name: str) -> bool:
+    return name.startswith(".") or name in _IGNORED_NAMES
+
+
+@lru_cache(maxsize=4096)
+def _directory_ignored(directory: str) -> bool:
+    return any(_is_ignored_name(part) for part in Path(directory).parts)
+
+
 def _iter_code_files(root: Path, extensions: Set[str]) -> Iterator[Path]:
-    for ext in extensions:
-        yield from (
-            path
-            for path in root.rglob(f"*{ext}")
-            if _path_within_root(path, root)
-            and not should_ignore(path.relative_to(root))
-        )
+    """Yield code files under ``root`` in a single walk, pruning ignored folders."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        # Prune in place so ignored trees (.venv, node_modules...) are never read.
+        dirnames[:] = [name for name in dirnames if not _is_ignored_name(name)]
+        for name in filenames:
+            if _is_ignored_name(name):
+                continue
+            if os.path.splitext(name)[1] in extensions:
+                yield Path(dirpath, name)
+
+
+def _count_lines(files: Sequence[Path]) -> int:
+    """Sum lines across files; large sets are read on a thread pool (I/O bound)."""
+    if len(files) < _LINE_COUNT_PARALLEL_MIN:
+        return sum(_count_file_lines(path) for path in files)
+    workers = min(_LINE_COUNT_MAX_WORKERS, len(files))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(_count_file_lines, files, chunksize=32))
 
 
 def _count_file_lines(path: Path) -> int:
+    """
+    Count lines on raw bytes (no decoding); a final unterminated line counts.
+
+    Matches text-mode universal newlines: LF, CRLF and a lone CR each end
+    one line.
+    """
+    lines = 0
+    last = b"\n"
     try:
-        with path.open("r", encoding="utf-8", errors="ignore") as handle:
-            return sum(1 for _ in handle)
+        with open(path, "rb", buffering=0) as handle:
+            while chunk := handle.read(_LINE_COUNT_CHUNK):
+                lines += chunk.count(b"\n")
+                if b"\r" in chunk:
+                    lines += chunk.count(b"\r") - chunk.count(b"\r\n")
+                # A CRLF split across two reads was counted twice.
+                if last == b"\r" and chunk[:1] == b"\n":
+                    lines -= 1
+                last = chunk[-1:]
     except OSError:
         return 0
-
-
-def _path_within_root(path: Path, root: Path) -> bool:
-    try:
-        path.relative_to(root)
-        return True
-    except ValueError:
-        return False
+    return lines if last in (b"\n", b"\r") else lines + 1
 
 
 def _select_stage_definition(
@@ -6,8 +6,9 @@ from __future__ import annotations
 
 import argparse
 import logging
+import sys
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Iterable, List, Optional
 
 import assess_stage
 
@@ -93,69 +94,74 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
 
 
 def _print_summary(result, config: InitializationConfig, log: logging.Logger) -> None:
+    """Assemble the summary and write it to stdout in a single call."""
     dest_dir = result.dest_dir
     project_name = dest_dir.name
 
     prefix = "[dry-run] " if config.dry_run else ""
-    print(f"{prefix}✓ Project '{project_name}' initialized at {dest_dir}")
+    lines: List[str] = [f"{prefix}✓ Project '{project_name}' initialized at {dest_dir}"]
 
     claude_dir = dest_dir / ".claude"
     codex_dir = dest_dir / ".codex"
     docs_dir = dest_dir / "docs"
 
     if config.agent_selection in {"claude", "both"}:
-        print(f"✓ Claude context files at: {claude_dir}")
+        lines.append(f"✓ Claude context files at: {claude_dir}")
     else:
-        print(
+        lines.append(
             f"ℹ️ Claude integration skipped (--agent={config.agent_selection}); core stage files stored at: {claude_dir}"
         )
 
     if config.agent_selection in {"codex", "both"}:
-        print(f"✓ Codex instructions at: {codex_dir}")
+        lines.append(f"✓ Codex instructions at: {codex_dir}")
     else:
-        print(f"ℹ️ Codex integration skipped (--agent={config.agent_selection})")
+        lines.append(f"ℹ️ Codex integration skipped (--agent={config.agent_selection})")
 
-    print(f"✓ Reference docs at: {docs_dir}")
+    lines.append(f"✓ Reference docs at: {docs_dir}")
 
     for category, summary in result.template_summaries.items():
         if summary.copied:
-            print(f"\nAdded {len(summary.copied)} {category} file(s):")
-            for item in summary.copied:
-                _print_file_change(item, "+", dest_dir)
+            lines.append(f"\nAdded {len(summary.copied)} {category} file(s):")
+            lines.extend(
+                _format_file_change(item, "+", dest_dir) for item in summary.copied
+            )
         if summary.skipped:
-            print(f"\nSkipped {len(summary.skipped)} existing {category} file(s):")
-            for item in summary.skipped:
-                _print_file_change(item, "-", dest_dir)
+            lines.append(
+                f"\nSkipped {len(summary.skipped)} existing {category} file(s):"
+            )
+            lines.extend(
+                _format_file_change(item, "-", dest_dir) for item in summary.skipped
+            )
 
     stage_result = result.stage_update
     if stage_result and stage_result.assessment:
         stage = stage_result.assessment.recommended_stage
         confidence = stage_result.assessment.confidence
-        print(f"\nStage detection: Stage {stage} ({confidence} confidence)")
-        for reason in stage_result.assessment.reasons[:5]:
-            print(f"  • {reason}")
+        lines.append(f"\nStage detection: Stage {stage} ({confidence} confidence)")
+        lines.extend(f"  • {reason}" for reason in stage_result.assessment.reasons[:5])
         if not config.dry_run and stage_result.current_phase_updated:
-            print("Updated .claude/01-current-phase.md with detected stage.")
+            lines.append("Updated .claude/01-current-phase.md with detected stage.")
     else:
-        print("\nStage detection unavailable.")
+        lines.append("\nStage detection unavailable.")
 
-    print("\nNext steps:")
-    print(f"  cd {dest_dir}")
-    print("  cat docs/QUICK_START.md  # Read this first")
+    lines.append("\nNext steps:")
+    lines.append(f"  cd {dest_dir}")
+    lines.append("  cat docs/QUICK_START.md  # Read this first")
     if config.dry_run:
-        print("  # Re-run without --dry-run to apply these changes")
+        lines.append("  # Re-run without --dry-run to apply these changes")
+    elif config.agent_selection == "both":
+        lines.append("  # Agents ready: Claude Code + Codex CLI")
+    elif config.agent_selection == "claude":
+        lines.append("  # Agent ready: Claude Code")
     else:
-        if config.agent_selection == "both":
-            print("  # Agents ready: Claude Code + Codex CLI")
-        elif config.agent_selection == "claude":
-            print("  # Agent ready: Claude Code")
-        else:
-            print("  # Agent ready: Codex CLI")
+        lines.append("  # Agent ready: Codex CLI")
 
+    sys.stdout.write("\n".join(lines) + "\n")
 
-def _print_file_change(path: Path, marker: str, dest_dir: Path) -> None:
+
+def _format_file_change(path: Path, marker: str, dest_dir: Path) -> str:
     try:
         relative = path.relative_to(dest_dir)
     except ValueError:
         relative = path
-    print(f"  {marker} {relative}")
+    return f"  {marker} {relative}"
@@ -5,13 +5,15 @@ High-level orchestration for stage-aware project initialization.
 from __future__ import annotations
 
 import logging
+import os
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 from .templates import TemplateSummary, copy_templates
 from .stage_update import (
+    STAGE_CACHE_FILENAME,
     StageUpdateResult,
     append_custom_instructions,
     detect_project_stage,
@@ -21,6 +23,26 @@ from .stage_update import (
 
 logger = logging.getLogger(__name__)
 
+# (category, path under templates/, destination folder in the project)
+_CORE_TEMPLATE_DIRS: Tuple[Tuple[str, Tuple[str, ...], str], ...] = (
+    ("claude", ("basic", ".claude"), ".claude"),
+    ("docs", ("docs",), "docs"),
+)
+_CODEX_TEMPLATE_DIRS: Tuple[Tuple[str, Tuple[str, ...], str], ...] = (
+    ("codex", ("basic", ".codex"), ".codex"),
+)
+
+_BASIC_CLAUDE_MD_TEMPLATE = (
+    "# {project_name}\n\n"
+    "This file contains project context and instructions for Claude Code.\n\n"
+    "## Project Overview\n\n"
+    "*Add project description here*\n\n"
+    "## Tech Stack\n\n"
+    "*Add technologies used here*\n\n"
+    "## Getting Started\n\n"
+    "*Add setup instructions here*\n"
+)
+
 
 @dataclass(frozen=True)
 class InitializationConfig:
@@ -105,7 +127,7 @@ class ProjectInitializer:
                     claude_md_path, dest_dir.name
                 )
 
-            if instructions_template and instructions_template.exists():
+            if instructions_template:
                 claude_instructions_appended = append_custom_instructions(
                     claude_md_path,
                     instructions_template,
@@ -113,7 +135,10 @@ class ProjectInitializer:
                     logger_override=self.log,
                 )
 
-        assessment = detect_project_stage(dest_dir)
+        stage_cache = (
+            None if self.config.dry_run else dest_dir / ".claude" / STAGE_CACHE_FILENAME
+        )
+        assessment = detect_project_stage(dest_dir, cache_path=stage_cache)
         current_phase_file = dest_dir / ".claude" / "01-current-phase.md"
         current_phase_updated = False
         if assessment and current_phase_file.exists():
@@ -122,6 +147,7 @@ class ProjectInitializer:
                 assessment,
                 dry_run=self.config.dry_run,
                 logger_override=self.log,
+                now=self.now,
             )
 
         stage_result = StageUpdateResult(
@@ -166,18 +192,15 @@ class ProjectInitializer:
     def _prepare_template_mappings(
         self, dest_dir: Path
     ) -> tuple[Dict[str, Path], Dict[str, Path]]:
-        template_sources: Dict[str, Path] = {
-            "claude": self.template_root / "basic" / ".claude",
-            "docs": self.template_root / "docs",
-        }
-        template_destinations: Dict[str, Path] = {
-            "claude": dest_dir / ".claude",
-            "docs": dest_dir / "docs",
-        }
-
+        categories = _CORE_TEMPLATE_DIRS
         if self._should_prepare_codex():
-            template_sources["codex"] = self.template_root / "basic" / ".codex"
-            template_destinations["codex"] = dest_dir / ".codex"
+            categories += _CODEX_TEMPLATE_DIRS
+
+        template_sources: Dict[str, Path] = {}
+        template_destinations: Dict[str, Path] = {}
+        for category, source_parts, dest_name in categories:
+            template_sources[category] = self.template_root.joinpath(*source_parts)
+            template_destinations[category] = dest_dir / dest_name
 
         for category, path in template_sources.items():
             if not path.exists():
@@ -196,9 +219,11 @@ class ProjectInitializer:
 
         if subagents_dir.exists():
             if agents_dir.exists():
+                # One listing instead of an exists() call per file.
+                existing = set(os.listdir(agents_dir))
                 for entry in subagents_dir.iterdir():
                     target = agents_dir / entry.name
-                    if target.exists():
+                    if entry.name in existing:
                         self.log.warning(
                             "Agent file already exists, leaving original in place: %s",
                             target,
@@ -224,16 +249,7 @@ class ProjectInitializer:
         return self.config.agent_selection in {"codex", "both"}
 
     def _write_basic_claude_md(self, claude_md_path: Path, project_name: str) -> bool:
-        content = (
-            f"# {project_name}\n\n"
-            "This file contains project context and instructions for Claude Code.\n\n"
-            "## Project Overview\n\n"
-            "*Add project description here*\n\n"
-            "## Tech Stack\n\n"
-            "*Add technologies used here*\n\n"
-            "## Getting Started\n\n"
-            "*Add setup instructions here*\n"
-        )
+        content = _BASIC_CLAUDE_MD_TEMPLATE.format(project_name=project_name)
         try:
             claude_md_path.write_text(content, encoding="utf-8")
             self.log.info("Created basic CLAUDE.md fallback at %s", claude_md_path)
@@ -4,19 +4,36 @@ Stage detection and documentation helpers for project initialization.
 
 from __future__ import annotations
 
+import contextlib
+import hashlib
+import json
 import logging
-import re
+import os
 import shutil
 import subprocess  # nosec B404 - ejecución controlada de la CLI de Claude
-from dataclasses import dataclass
+import tempfile
+from dataclasses import asdict, dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
-from stage_config import StageAssessment
+from stage_config import (
+    StageAssessment,
+    StageMetrics,
+    code_tree_signature,
+    collect_metrics,
+)
 
 logger = logging.getLogger(__name__)
 
+# Also matches the "## ..." heading written by older versions.
+_CUSTOM_INSTRUCTIONS_MARKER = b"# Custom Workflow Instructions"
+_CUSTOM_INSTRUCTIONS_STAMP = ".custom_instructions.sha256"
+_STAGE_SECTION_HEADING = "## 🎯 Detected Stage:"
+STAGE_CACHE_FILENAME = ".stage_cache.json"
+_STAGE_CACHE_VERSION = 2
+
 
 @dataclass
 class StageUpdateResult:
@@ -28,6 +45,12 @@ class StageUpdateResult:
     claude_instructions_appended: bool
 
 
+@lru_cache(maxsize=1)
+def _claude_binary() -> Optional[str]:
+    """Resolve the claude CLI once per process (batch runs reuse the lookup)."""
+    return shutil.which("claude")
+
+
 def run_claude_init(
     project_path: Path,
     *,
@@ -40,23 +63,26 @@ def run_claude_init(
         log.info("[dry-run] Would run 'claude -p /init' in %s", project_path)
         return False
 
-    claude_binary = shutil.which("claude")
+    claude_binary = _claude_binary()
     if not claude_binary:
         log.warning("'claude' command not found in PATH")
         return False
 
     try:
-        exec_result = subprocess.run(  # nosec B603 - invocación explícita y validada
+        # Inherit stdout/stderr so claude's progress streams to the user.
+        process = subprocess.Popen(  # nosec B603 - invocación explícita y validada
             [claude_binary, "-p", "/init"],
             cwd=str(project_path),
-            capture_output=True,
-            text=True,
-            timeout=120,
-            check=False,
         )
-
-        if exec_result.returncode != 0:
-            log.warning("claude /init failed: %s", exec_result.stderr.strip())
+        try:
+            returncode = process.wait(timeout=120)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            raise
+
+        if returncode != 0:
+            log.warning("claude /init failed with exit code %s", returncode)
             return False
 
         claude_md = project_path / "CLAUDE.md"
@@ -79,11 +105,18 @@ def append_custom_instructions(
     dry_run: bool = False,
     logger_override: Optional[logging.Logger] = None,
 ) -> bool:
-    """Append custom instructions to CLAUDE.md if they are not already present."""
+    """Append custom instructions to CLAUDE.md if they are not already present.
+
+    The existing content is left byte-for-byte as is (CRLF line endings
+    included); only the appended block is written, with LF newlines.
+    """
 
     log = logger_override or logger
 
     if dry_run:
+        if not instructions_template.is_file():
+            log.debug("No custom instructions template at %s", instructions_template)
+            return False
         if claude_md_path.exists():
             log.info("[dry-run] Would append custom instructions to %s", claude_md_path)
         else:
@@ -92,63 +125,224 @@ def append_custom_instructions(
             )
         return True
 
-    if not claude_md_path.exists():
+    try:
+        claude_md_stat = claude_md_path.stat()
+    except OSError:
         log.warning("CLAUDE.md not found at %s", claude_md_path)
         return False
 
     try:
         custom_content = instructions_template.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        log.debug("No custom instructions template at %s", instructions_template)
+        return False
     except OSError as exc:
         log.warning("Cannot read custom instructions template: %s", exc)
         return False
 
+    # Stamp: instructions hash plus CLAUDE.md (mtime, size) after the last append.
+    digest = hashlib.sha256(custom_content.encode("utf-8")).hexdigest()
+    stamp_path = claude_md_path.parent / ".claude" / _CUSTOM_INSTRUCTIONS_STAMP
+    if _read_stamp(stamp_path) == _format_stamp(digest, claude_md_stat):
+        log.debug("Custom instructions already present in CLAUDE.md (stamp)")
+        return False
+
     try:
-        current_content = claude_md_path.read_text(encoding="utf-8")
+        current_content = _read_bytes(claude_md_path)
     except OSError as exc:
         log.warning("Cannot read CLAUDE.md: %s", exc)
         return False
 
-    if "## Custom Workflow Instructions" in current_content:
+    # The marker is ASCII: search the raw bytes, decode only before appending.
+    if _CUSTOM_INSTRUCTIONS_MARKER in current_content:
         log.debug("Custom instructions already present in CLAUDE.md")
+        _write_stamp(stamp_path, digest, claude_md_path)
+        return False
+
+    try:
+        current_content.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        log.warning("Cannot read CLAUDE.md: %s", exc)
         return False
 
     separator = (
         "\n\n---\n\n# Custom Workflow Instructions\n\n"
         "<!-- Added by stage-aware initializer -->\n\n"
     )
-    updated_content = current_content.rstrip() + separator + custom_content
 
     try:
-        claude_md_path.write_text(updated_content, encoding="utf-8")
+        # Binary mode: text mode would write CRLF on Windows.
+        with claude_md_path.open("ab") as handle:
+            handle.write((separator + custom_content).encode("utf-8"))
     except OSError as exc:
         log.warning("Failed to write CLAUDE.md after appending instructions: %s", exc)
         return False
 
+    _write_stamp(stamp_path, digest, claude_md_path)
+
     log.info("Custom instructions appended to %s", claude_md_path)
     return True
 
 
+def _replace_stage_sections(content: str, section: str) -> Optional[str]:
+    """
+    Replace every detected-stage section (up to the next ``##`` heading).
+
+    Plain ``str.find`` scans instead of a DOTALL regex; returns None when the
+    content has no such section.
+    """
+    start = content.find(_STAGE_SECTION_HEADING)
+    if start < 0:
+        return None
+
+    pieces = []
+    position = 0
+    while start >= 0:
+        end = content.find("\n##", start + len(_STAGE_SECTION_HEADING))
+        if end < 0:
+            end = len(content)
+        pieces.append(content[position:start])
+        pieces.append(section)
+        position = end
+        start = content.find(_STAGE_SECTION_HEADING, end)
+    pieces.append(content[position:])
+    return "".join(pieces)
+
+
+def _read_bytes(path: Path) -> bytes:
+    """Read a whole file through an unbuffered FileIO (no BufferedReader)."""
+    with open(path, "rb", buffering=0) as handle:
+        return handle.readall()
+
+
+def _read_text(path: Path) -> str:
+    """Read a UTF-8 file with universal newlines, like ``Path.read_text``.
+
+    Raises:
+        OSError: If the file cannot be read.
+        UnicodeDecodeError: If the file is not valid UTF-8.
+    """
+    text = _read_bytes(path).decode("utf-8")
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _write_bytes(path: Path, data: bytes) -> None:
+    """
+    Replace a file's contents atomically.
+
+    Writes a temporary file in the same directory and renames it over ``path``
+    with ``os.replace``, so a failure midway never leaves a truncated file.
+    """
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        try:
+            shutil.copymode(path, temp_name)
+        except OSError:
+            os.chmod(temp_name, 0o644)  # nosec B103 - standard document permissions
+        os.replace(temp_name, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(temp_name)
+        raise
+
+
+def _format_stamp(digest: str, stat_result: os.stat_result) -> str:
+    return f"{digest} {stat_result.st_mtime_ns} {stat_result.st_size}"
+
+
+def _read_stamp(stamp_path: Path) -> Optional[str]:
+    try:
+        return stamp_path.read_text(encoding="utf-8").strip()
+    except (OSError, UnicodeError):
+        return None
+
+
+def _write_stamp(stamp_path: Path, digest: str, claude_md_path: Path) -> None:
+    """Best effort: without the stamp the next run simply re-reads CLAUDE.md."""
+    try:
+        stamp = _format_stamp(digest, claude_md_path.stat())
+        stamp_path.write_text(stamp + "\n", encoding="utf-8")
+    except OSError as exc:
+        logger.debug("Cannot write %s: %s", stamp_path, exc)
+
+
 def detect_project_stage(
-    root: Path, *, precomputed: Optional[StageAssessment] = None
+    root: Path,
+    *,
+    precomputed: Optional[StageAssessment] = None,
+    cache_path: Optional[Path] = None,
 ) -> Optional[StageAssessment]:
-    """Detect the stage for the given project root."""
+    """
+    Detect the stage for the given project root.
+
+    With ``cache_path`` the collected metrics are stored next to a signature of
+    the code tree (paths, sizes, mtimes); later runs on an unchanged tree skip
+    reading every file and only re-evaluate the thresholds.
+    """
     if precomputed is not None:
         return precomputed
 
     import assess_stage  # local import to avoid optional dependency noise at import time
 
-    assessment = assess_stage.assess_stage(root, return_dataclass=True)
+    metrics = None
+    if cache_path is not None and root.exists():
+        metrics = _cached_stage_metrics(root, cache_path)
+
+    assessment = assess_stage.assess_stage(root, metrics=metrics, return_dataclass=True)
     return assessment
 
 
+def _cached_stage_metrics(root: Path, cache_path: Path) -> StageMetrics:
+    signature = code_tree_signature(root)
+    cached = _load_stage_cache(cache_path, signature)
+    if cached is not None:
+        return cached
+
+    metrics = collect_metrics(root)
+    payload = {
+        "version": _STAGE_CACHE_VERSION,
+        "signature": signature,
+        "metrics": asdict(metrics),
+    }
+    try:
+        _write_bytes(cache_path, json.dumps(payload).encode("utf-8"))
+    except OSError as exc:
+        logger.debug("Cannot write stage cache %s: %s", cache_path, exc)
+    return metrics
+
+
+def _load_stage_cache(cache_path: Path, signature: str) -> Optional[StageMetrics]:
+    """Return the cached metrics if they match ``signature`` (None otherwise)."""
+    try:
+        payload = json.loads(cache_path.read_text(encoding="utf-8"))
+        if (
+            payload.get("version") != _STAGE_CACHE_VERSION
+            or payload.get("signature") != signature
+        ):
+            return None
+        return StageMetrics(**payload["metrics"])
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        return None
+
+
 def update_current_phase_with_stage(
     current_phase_file: Path,
     assessment: StageAssessment,
     *,
     dry_run: bool = False,
     logger_override: Optional[logging.Logger] = None,
+    now: Optional[datetime] = None,
 ) -> bool:
-    """Inject detected stage details into 01-current-phase.md."""
+    """Inject detected stage details into 01-current-phase.md.
+
+    ``now`` lets callers reuse the timestamp already used for placeholders so
+    every file written during one run agrees on the date.
+
+    The file is read as UTF-8 with universal newlines and written back with
+    LF line endings; a file that is not valid UTF-8 is left untouched.
+    """
 
     log = logger_override or logger
     if dry_run:
@@ -156,8 +350,8 @@ def update_current_phase_with_stage(
         return True
 
     try:
-        content = current_phase_file.read_text(encoding="utf-8")
-    except OSError as exc:
+        content = _read_text(current_phase_file)
+    except (OSError, UnicodeDecodeError) as exc:
         log.warning("Failed to read %s: %s", current_phase_file, exc)
         return False
 
@@ -165,16 +359,15 @@ def update_current_phase_with_stage(
     confidence = assessment.confidence.title()
     reasons = assessment.reasons
     metrics = assessment.metrics
+    detected_at = now or datetime.now()
 
-    stage_section = (
+    parts = [
         f"\n\n## 🎯 Detected Stage: Stage {stage} ({confidence} Confidence)\n\n"
-        f"**Auto-detected on:** {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n"
+        f"**Auto-detected on:** {detected_at.strftime('%Y-%m-%d %H:%M')}\n\n"
         "**Detection reasoning:**\n"
-    )
-    for reason in reasons[:5]:
-        stage_section += f"- {reason}\n"
-
-    stage_section += (
+    ]
+    parts.extend(f"- {reason}\n" for reason in reasons[:5])
+    parts.append(
         "\n**Metrics:**\n"
         f"- Files: {metrics.file_count}\n"
         f"- LOC: ~{metrics.lines_of_code}\n"
@@ -185,15 +378,14 @@ def update_current_phase_with_stage(
         "- Use stage-aware subagents for guidance\n"
         "- Re-assess stage after significant changes\n"
     )
+    stage_section = "".join(parts)
 
-    section_pattern = re.compile(r"## 🎯 Detected Stage:.*?(?=\n##|\Z)", re.DOTALL)
-    if section_pattern.search(content):
-        updated_content = section_pattern.sub(stage_section.strip(), content)
-    else:
+    updated_content = _replace_stage_sections(content, stage_section.strip())
+    if updated_content is None:
         updated_content = content.rstrip() + stage_section
 
     try:
-        current_phase_file.write_text(updated_content, encoding="utf-8")
+        _write_bytes(current_phase_file, updated_content.encode("utf-8"))
     except OSError as exc:
         log.warning("Failed to write %s: %s", current_phase_file, exc)
         return False
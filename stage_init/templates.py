@@ -4,14 +4,47 @@ Utilities for working with template files used during project initialization.
 
 from __future__ import annotations
 
+import contextlib
+import errno
 import logging
+import os
+import re
 import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Mapping, MutableMapping, Optional
+from typing import (
+    BinaryIO,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Pattern,
+    Tuple,
+)
+
+try:  # pragma: no cover - no fcntl on Windows
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
 
 logger = logging.getLogger(__name__)
 
+_MAX_COPY_WORKERS = 32
+_COPY_BUFSIZE = 64 * 1024
+
+# Linux FICLONE ioctl (_IOW(0x94, 9, int)): clones extents on CoW filesystems.
+_FICLONE = 0x40049409
+_REFLINK_UNSUPPORTED = frozenset(
+    {errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL}
+)
+# The ioctl number only means FICLONE on Linux.
+_reflink_enabled = sys.platform.startswith("linux") and fcntl is not None
+
 
 @dataclass
 class TemplateSummary:
@@ -46,7 +79,10 @@ def copy_templates(
     logger_override: Optional[logging.Logger] = None,
 ) -> Dict[str, TemplateSummary]:
     """
-    Copy template files category by category.
+    Copy template files for every category.
+
+    Folders are walked category by category, then all file copies run on one
+    thread pool; each summary keeps its files in walk order.
 
     Args:
         sources: Mapping from category name to template directory.
@@ -57,6 +93,9 @@ def copy_templates(
 
     log = logger_override or logger
     outcomes: Dict[str, TemplateSummary] = {}
+    # One pool for every category: the copies are independent.
+    jobs: List[Tuple[str, str]] = []
+    owners: List[TemplateSummary] = []
 
     for category, source_dir in sources.items():
         dest_dir = destinations.get(category)
@@ -65,129 +104,224 @@ def copy_templates(
         summary = TemplateSummary()
         outcomes[category] = summary
 
-        if not source_dir.exists():
+        try:
+            category_jobs = _collect_copy_jobs(
+                os.fspath(source_dir), os.fspath(dest_dir), dry_run=dry_run, log=log
+            )
+        except FileNotFoundError:
             log.warning("Template directory missing for %s: %s", category, source_dir)
             continue
+        jobs.extend(category_jobs)
+        owners.extend([summary] * len(category_jobs))
 
-        _ensure_directory(dest_dir, dry_run=dry_run, log=log)
-
-        for template_file in source_dir.iterdir():
-            if template_file.is_dir():
-                summary.merge(
-                    _copy_directory(
-                        template_file,
-                        dest_dir / template_file.name,
-                        placeholders=placeholders,
-                        dry_run=dry_run,
-                        log=log,
-                    )
-                )
-            else:
-                _copy_file(
-                    template_file,
-                    dest_dir / template_file.name,
-                    summary,
-                    placeholders=placeholders,
-                    dry_run=dry_run,
-                    log=log,
-                )
+    results = _run_copy_jobs(jobs, placeholders=placeholders, dry_run=dry_run, log=log)
+    for summary, (_, destination), copied in zip(owners, jobs, results):
+        if copied:
+            summary.record_copied(Path(destination))
+        else:
+            summary.record_skipped(Path(destination))
 
     return outcomes
 
 
-def _copy_directory(
-    source_dir: Path,
-    dest_dir: Path,
+def _collect_copy_jobs(
+    source_dir: str,
+    dest_dir: str,
     *,
-    placeholders: Optional[MutableMapping[str, str]],
     dry_run: bool,
     log: logging.Logger,
-) -> TemplateSummary:
-    summary = TemplateSummary()
-    if not source_dir.exists():
-        log.warning("Directory not found: %s", source_dir)
-        return summary
+) -> List[Tuple[str, str]]:
+    """
+    Walk ``source_dir`` creating destination folders and listing file copies.
+
+    Uses ``os.scandir`` so directory checks come from the directory listing
+    itself instead of one ``stat`` per entry. Paths stay plain strings in the
+    per-file loop; ``Path`` objects are only built for the summary.
+
+    Raises:
+        FileNotFoundError: If ``source_dir`` does not exist.
+    """
+    with os.scandir(source_dir) as iterator:
+        entries = list(iterator)
 
     _ensure_directory(dest_dir, dry_run=dry_run, log=log)
 
-    for item in source_dir.iterdir():
-        destination = dest_dir / item.name
-        if item.is_dir():
-            summary.merge(
-                _copy_directory(
-                    item,
-                    destination,
-                    placeholders=placeholders,
-                    dry_run=dry_run,
-                    log=log,
-                )
+    jobs: List[Tuple[str, str]] = []
+    for entry in entries:
+        source = entry.path
+        destination = os.path.join(dest_dir, entry.name)
+        if entry.is_dir():
+            jobs.extend(
+                _collect_copy_jobs(source, destination, dry_run=dry_run, log=log)
             )
         else:
-            _copy_file(
-                item,
-                destination,
-                summary,
-                placeholders=placeholders,
-                dry_run=dry_run,
-                log=log,
-            )
-    return summary
+            jobs.append((source, destination))
+    return jobs
 
 
-def _copy_file(
-    source: Path,
-    destination: Path,
-    summary: TemplateSummary,
+def _run_copy_jobs(
+    jobs: List[Tuple[str, str]],
     *,
     placeholders: Optional[MutableMapping[str, str]],
     dry_run: bool,
     log: logging.Logger,
-) -> None:
-    if destination.exists():
-        log.debug("Skipping existing file: %s", destination)
-        summary.record_skipped(destination)
-        return
+) -> List[bool]:
+    """Copy files (I/O bound) on a thread pool; results keep the order of ``jobs``."""
+
+    def copy_one(job: Tuple[str, str]) -> bool:
+        source, destination = job
+        return _copy_file(
+            source, destination, placeholders=placeholders, dry_run=dry_run, log=log
+        )
+
+    if len(jobs) < 2:
+        return [copy_one(job) for job in jobs]
+    with ThreadPoolExecutor(max_workers=min(_MAX_COPY_WORKERS, len(jobs))) as pool:
+        return list(pool.map(copy_one, jobs))
+
 
+def _copy_file(
+    source: str,
+    destination: str,
+    *,
+    placeholders: Optional[MutableMapping[str, str]],
+    dry_run: bool,
+    log: logging.Logger,
+) -> bool:
+    """Copy one template file; returns False when the destination already exists."""
     if dry_run:
+        if os.path.exists(destination):
+            log.debug("Skipping existing file: %s", destination)
+            return False
         log.info("[dry-run] Would copy %s -> %s", source, destination)
-        summary.record_copied(destination)
-        return
+        return True
+
+    # O_EXCL skips existing files without a separate exists() check.
+    try:
+        handle = open(destination, "xb")
+    except FileExistsError:
+        log.debug("Skipping existing file: %s", destination)
+        return False
 
     log.info("Copying %s -> %s", source, destination)
-    _ensure_directory(destination.parent, dry_run=False, log=log)
-    shutil.copy2(source, destination)
+    try:
+        with handle:
+            # Render in memory so the file is written once.
+            rendered = (
+                _render_placeholders(source, placeholders, log=log)
+                if placeholders
+                else None
+            )
+            if rendered is not None:
+                handle.write(rendered)
+            else:
+                with open(source, "rb") as src:
+                    _copy_into(src, handle)
+        # Permission bits only; template timestamps are irrelevant.
+        shutil.copymode(source, destination)
+    except BaseException:
+        # A partial file would be skipped as "existing" on every later run.
+        with contextlib.suppress(OSError):
+            os.unlink(destination)
+        raise
+    return True
+
+
+def _copy_into(src: BinaryIO, dst: BinaryIO) -> None:
+    """
+    Copy the open ``src`` into the empty ``dst``, cloning extents when possible.
 
-    if placeholders:
-        _apply_placeholders(destination, placeholders, log=log)
+    On btrfs/xfs a reflink shares the data blocks instead of copying bytes.
+    Otherwise the data stays in the kernel via ``os.copy_file_range`` or
+    ``os.sendfile``; a chunked read/write loop is the last resort.
+    """
+    global _reflink_enabled
+    if _reflink_enabled:
+        try:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        except OSError as exc:
+            if exc.errno not in _REFLINK_UNSUPPORTED:
+                raise
+            # Same filesystems for the whole run: do not try again.
+            _reflink_enabled = False
+        else:
+            return
+
+    src_fd, dst_fd = src.fileno(), dst.fileno()
+    size = os.fstat(src_fd).st_size
+    if hasattr(os, "copy_file_range") and _kernel_copy(
+        lambda offset, count: os.copy_file_range(src_fd, dst_fd, count, offset, offset),
+        size,
+    ):
+        return
+    if hasattr(os, "sendfile") and _kernel_copy(
+        lambda offset, count: os.sendfile(dst_fd, src_fd, offset, count), size
+    ):
+        return
+    for chunk in iter(lambda: src.read(_COPY_BUFSIZE), b""):
+        dst.write(chunk)
 
-    summary.record_copied(destination)
 
+def _kernel_copy(copy_chunk: Callable[[int, int], int], size: int) -> bool:
+    """
+    Drive ``copy_chunk(offset, count)`` until ``size`` bytes are copied.
 
-def _apply_placeholders(
-    target: Path,
+    Returns False if the primitive fails before copying anything, so the caller
+    can try the next one; a failure halfway through is re-raised.
+    """
+    offset = 0
+    try:
+        while offset < size:
+            copied = copy_chunk(offset, size - offset)
+            if copied == 0:
+                break
+            offset += copied
+    except OSError:
+        if offset:
+            raise
+        return False
+    return True
+
+
+def _render_placeholders(
+    source: str,
     placeholders: Mapping[str, str],
     *,
     log: logging.Logger,
-) -> None:
-    try:
-        content = target.read_text(encoding="utf-8")
-    except (OSError, UnicodeError) as exc:
-        log.debug("Skipping placeholder replacement for %s (%s)", target, exc)
-        return
-
-    for key, value in placeholders.items():
-        content = content.replace(key, value)
-
-    try:
-        target.write_text(content, encoding="utf-8")
-    except (OSError, UnicodeError) as exc:
-        log.warning("Unable to write %s after placeholder replacement: %s", target, exc)
-
-
-def _ensure_directory(path: Path, *, dry_run: bool, log: logging.Logger) -> None:
-    if path.exists():
+) -> Optional[bytes]:
+    """Return ``source`` with placeholders substituted (None if it is not UTF-8 text)."""
+    with open(source, "rb", buffering=0) as handle:
+        raw = handle.readall()
+    pattern, replacements = _compile_placeholders(tuple(placeholders.items()))
+    # Most templates have no placeholders: copy them without decoding.
+    if not any(key in raw for key in replacements):
+        return raw
+    # Substitute on bytes; only non-ASCII content needs the UTF-8 check.
+    if not raw.isascii():
+        try:
+            raw.decode("utf-8")
+        except UnicodeDecodeError as exc:
+            log.debug("Skipping placeholder replacement for %s (%s)", source, exc)
+            return None
+
+    return pattern.sub(lambda match: replacements[match.group(0)], raw)
+
+
+@lru_cache(maxsize=8)
+def _compile_placeholders(
+    items: Tuple[Tuple[str, str], ...]
+) -> Tuple[Pattern[bytes], Dict[bytes, bytes]]:
+    """Compile one bytes alternation of all placeholders (longest key first)."""
+    replacements = {key.encode("utf-8"): value.encode("utf-8") for key, value in items}
+    ordered = sorted(replacements, key=len, reverse=True)
+    pattern = re.compile(b"|".join(re.escape(key) for key in ordered))
+    return pattern, replacements
+
+
+def _ensure_directory(path: str, *, dry_run: bool, log: logging.Logger) -> None:
+    if os.path.exists(path):
         return
     if dry_run:
         log.info("[dry-run] Would create directory: %s", path)
         return
-    path.mkdir(parents=True, exist_ok=True)
+    os.makedirs(path, exist_ok=True)
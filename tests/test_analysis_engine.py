@@ -107,6 +107,18 @@ class Bar:
     assert docs["baz"] == "Baz docstring."
 
 
+def test_file_analyzer_respects_encoding_declaration(tmp_path: Path) -> None:
+    source = tmp_path / "latin.py"
+    source.write_bytes(
+        "# -*- coding: latin-1 -*-\ndef año():\n    pass\n".encode("latin-1")
+    )
+
+    summary = FileAnalyzer().parse(source)
+
+    assert not summary.errors
+    assert [symbol.name for symbol in summary.symbols] == ["año"]
+
+
 def test_symbol_index_builds_tree_structure(tmp_path: Path) -> None:
     write_module(tmp_path, "a/__init__.py", "")
     file_one = write_module(tmp_path, "a/feature.py", "def run():\n    return True")
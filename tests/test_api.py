@@ -203,6 +203,20 @@ def test_rescan_endpoint_triggers_scan(api_client: TestClient, tmp_path: Path) -
     assert response.json()["files"] >= 1
 
 
+def test_uml_endpoint_rebuilds_without_watcher(tmp_path: Path, monkeypatch) -> None:
+    write_file(tmp_path, "pkg/module.py", "class Demo:\n    pass")
+    app, state = create_test_app(tmp_path)
+    monkeypatch.setattr(state.watcher, "start", lambda: False)
+
+    with TestClient(app) as client:
+        first = client.get("/graph/uml").json()
+        write_file(tmp_path, "pkg/extra.py", "class Extra:\n    pass")
+        second = client.get("/graph/uml").json()
+
+    assert {cls["name"] for cls in first["classes"]} == {"Demo"}
+    assert {cls["name"] for cls in second["classes"]} == {"Demo", "Extra"}
+
+
 def test_ollama_status_endpoint_returns_payload(
     api_client: TestClient, monkeypatch
 ) -> None:
@@ -6,6 +6,7 @@ from stage_config import (
     evaluate_stage,
 )
 import assess_stage
+import stage_config
 from code_map import ProjectScanner, SymbolIndex
 
 
@@ -99,3 +100,15 @@ def main():
     )
     assert assessment_obj is not None
     assert assessment_obj.recommended_stage == payload["recommended_stage"]
+
+
+def test_collect_metrics_counts_universal_newlines(tmp_path: Path, monkeypatch) -> None:
+    # Tiny reads so a CRLF pair straddles two chunks.
+    monkeypatch.setattr(stage_config, "_LINE_COUNT_CHUNK", 3)
+    (tmp_path / "cr.py").write_bytes(b"a = 1\rb = 2\rc = 3")
+    (tmp_path / "crlf.py").write_bytes(b"ab\r\ncd\r\n")
+    (tmp_path / "lf.py").write_bytes(b"a\nb\n\nc")
+
+    metrics = collect_metrics(tmp_path)
+
+    assert metrics.lines_of_code == 3 + 2 + 4
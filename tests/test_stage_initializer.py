@@ -4,6 +4,7 @@ from pathlib import Path
 import pytest
 
 from stage_init.initializer import InitializationConfig, ProjectInitializer
+from stage_init.templates import copy_templates
 
 
 @pytest.fixture(autouse=True)
@@ -51,3 +52,81 @@ def test_initializer_creates_files(tmp_path: Path) -> None:
         "claude"
     ].copied  # nosec B101 - verificación de test
     assert result.stage_update is not None  # nosec B101 - verificación de test
+
+
+def test_copy_templates_replaces_placeholders_in_one_pass(tmp_path: Path) -> None:
+    source = tmp_path / "templates"
+    source.mkdir()
+    (source / "brief.md").write_text(
+        "# {{PROJECT_NAME}}\nCreated {{DATE}} ({{YEAR}}) by {{PROJECT_NAME}}\n",
+        encoding="utf-8",
+    )
+    (source / "plain.md").write_text("No placeholders here\n", encoding="utf-8")
+    dest = tmp_path / "out"
+
+    summaries = copy_templates(
+        {"docs": source},
+        {"docs": dest},
+        placeholders={
+            "{{PROJECT_NAME}}": "demo {{DATE}}",
+            "{{DATE}}": "2025-01-02",
+            "{{YEAR}}": "2025",
+        },
+    )
+
+    assert sorted(path.name for path in summaries["docs"].copied) == [
+        "brief.md",
+        "plain.md",
+    ]
+    # Substituted values are not themselves re-expanded.
+    assert (dest / "brief.md").read_text(encoding="utf-8") == (
+        "# demo {{DATE}}\nCreated 2025-01-02 (2025) by demo {{DATE}}\n"
+    )
+    assert (dest / "plain.md").read_text(encoding="utf-8") == "No placeholders here\n"
+
+
+def test_copy_templates_copies_binary_files_verbatim(tmp_path: Path) -> None:
+    source = tmp_path / "templates"
+    source.mkdir()
+    payload = b"\xff\xfe{{DATE}}\r\n\x00"
+    (source / "logo.bin").write_bytes(payload)
+    (source / "notes.md").write_bytes(b"line {{DATE}}\r\nnext\r\n")
+    dest = tmp_path / "out"
+
+    copy_templates(
+        {"docs": source}, {"docs": dest}, placeholders={"{{DATE}}": "2025-01-02"}
+    )
+
+    assert (dest / "logo.bin").read_bytes() == payload
+    assert (dest / "notes.md").read_bytes() == b"line 2025-01-02\r\nnext\r\n"
+
+
+def test_copy_templates_never_overwrites_existing_files(tmp_path: Path) -> None:
+    source = tmp_path / "templates"
+    source.mkdir()
+    (source / "keep.md").write_text("template {{DATE}}\n", encoding="utf-8")
+    (source / "new.md").write_text("fresh\n", encoding="utf-8")
+    dest = tmp_path / "out"
+    dest.mkdir()
+    (dest / "keep.md").write_text("user edits\n", encoding="utf-8")
+
+    summaries = copy_templates(
+        {"docs": source}, {"docs": dest}, placeholders={"{{DATE}}": "2025-01-02"}
+    )
+
+    assert summaries["docs"].skipped == [dest / "keep.md"]
+    assert summaries["docs"].copied == [dest / "new.md"]
+    assert (dest / "keep.md").read_text(encoding="utf-8") == "user edits\n"
+    assert (dest / "new.md").read_text(encoding="utf-8") == "fresh\n"
+
+
+def test_copy_templates_leaves_no_partial_file_on_failure(tmp_path: Path) -> None:
+    source = tmp_path / "templates"
+    source.mkdir()
+    (source / "broken.md").symlink_to(tmp_path / "missing.md")
+    dest = tmp_path / "out"
+
+    with pytest.raises(FileNotFoundError):
+        copy_templates({"docs": source}, {"docs": dest})
+
+    assert not (dest / "broken.md").exists()
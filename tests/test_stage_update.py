@@ -0,0 +1,157 @@
+from datetime import datetime
+from pathlib import Path
+
+from stage_config import StageAssessment, StageMetrics
+from stage_init import stage_update
+from stage_init.stage_update import (
+    append_custom_instructions,
+    detect_project_stage,
+    update_current_phase_with_stage,
+)
+
+
+def make_assessment(stage: int) -> StageAssessment:
+    metrics = StageMetrics(
+        file_count=3,
+        lines_of_code=120,
+        directory_count=1,
+        patterns_found=[],
+        architectural_folders=[],
+    )
+    return StageAssessment(
+        recommended_stage=stage,
+        confidence="high",
+        reasons=["few files"],
+        metrics=metrics,
+        diagnostics=None,  # type: ignore[arg-type]
+    )
+
+
+def test_append_custom_instructions_is_idempotent(tmp_path: Path) -> None:
+    claude_md = tmp_path / "CLAUDE.md"
+    claude_md.write_text("# Project\n", encoding="utf-8")
+    template = tmp_path / "CUSTOM_INSTRUCTIONS.md"
+    template.write_text("## 🎯 PROJECT CONTEXT\n", encoding="utf-8")
+
+    assert append_custom_instructions(claude_md, template)
+    first = claude_md.read_text(encoding="utf-8")
+    assert first.startswith("# Project\n")
+    assert first.count("# Custom Workflow Instructions") == 1
+    assert first.endswith("## 🎯 PROJECT CONTEXT\n")
+
+    assert not append_custom_instructions(claude_md, template)
+    assert claude_md.read_text(encoding="utf-8") == first
+
+
+def test_append_custom_instructions_appends_lf_bytes(tmp_path: Path) -> None:
+    claude_md = tmp_path / "CLAUDE.md"
+    claude_md.write_bytes(b"# Project\r\nnotes\r\n")
+    template = tmp_path / "CUSTOM_INSTRUCTIONS.md"
+    template.write_text("Follow the stage rules.\n", encoding="utf-8")
+
+    assert append_custom_instructions(claude_md, template)
+
+    content = claude_md.read_bytes()
+    assert content.startswith(b"# Project\r\nnotes\r\n\n\n---\n")
+    assert b"\r" not in content[len(b"# Project\r\nnotes\r\n") :]
+
+
+def test_append_custom_instructions_skips_invalid_utf8(tmp_path: Path) -> None:
+    claude_md = tmp_path / "CLAUDE.md"
+    claude_md.write_bytes(b"# Project \xff\n")
+    template = tmp_path / "CUSTOM_INSTRUCTIONS.md"
+    template.write_text("Follow the stage rules.\n", encoding="utf-8")
+
+    assert not append_custom_instructions(claude_md, template)
+    assert claude_md.read_bytes() == b"# Project \xff\n"
+
+
+def test_append_custom_instructions_stamp_tracks_claude_md(tmp_path: Path) -> None:
+    (tmp_path / ".claude").mkdir()
+    claude_md = tmp_path / "CLAUDE.md"
+    claude_md.write_text("# Project\n", encoding="utf-8")
+    template = tmp_path / "CUSTOM_INSTRUCTIONS.md"
+    template.write_text("Follow the stage rules.\n", encoding="utf-8")
+
+    assert append_custom_instructions(claude_md, template)
+    assert (tmp_path / ".claude" / ".custom_instructions.sha256").exists()
+    assert not append_custom_instructions(claude_md, template)
+
+    # CLAUDE.md regenerated (e.g. by `claude /init`): the stamp no longer
+    # matches, so the instructions are appended again.
+    claude_md.write_text("# Regenerated project notes\n", encoding="utf-8")
+    assert append_custom_instructions(claude_md, template)
+    assert "Follow the stage rules." in claude_md.read_text(encoding="utf-8")
+
+
+def test_append_custom_instructions_dry_run_needs_template(tmp_path: Path) -> None:
+    claude_md = tmp_path / "CLAUDE.md"
+    claude_md.write_text("# Project\n", encoding="utf-8")
+    template = tmp_path / "CUSTOM_INSTRUCTIONS.md"
+
+    assert not append_custom_instructions(claude_md, template, dry_run=True)
+    template.write_text("Follow the stage rules.\n", encoding="utf-8")
+    assert append_custom_instructions(claude_md, template, dry_run=True)
+    assert claude_md.read_text(encoding="utf-8") == "# Project\n"
+
+
+def test_update_current_phase_replaces_existing_section(tmp_path: Path) -> None:
+    phase = tmp_path / "01-current-phase.md"
+    phase.write_text("# Phase\n\n## Notes\nkeep me\n", encoding="utf-8")
+    now = datetime(2025, 1, 2, 3, 4)
+
+    assert update_current_phase_with_stage(phase, make_assessment(1), now=now)
+    assert update_current_phase_with_stage(phase, make_assessment(2), now=now)
+
+    content = phase.read_text(encoding="utf-8")
+    assert content.count("Detected Stage:") == 1
+    assert "Stage 2 (High Confidence)" in content
+    assert "**Auto-detected on:** 2025-01-02 03:04" in content
+    assert content.startswith("# Phase\n\n## Notes\nkeep me\n")
+
+
+def test_update_current_phase_normalizes_crlf(tmp_path: Path) -> None:
+    phase = tmp_path / "01-current-phase.md"
+    phase.write_bytes(
+        "# Phase\r\n\r\n## 🎯 Detected Stage: Stage 1\r\nold\r\n"
+        "## Notes\r\nkeep me\r\n".encode("utf-8")
+    )
+
+    assert update_current_phase_with_stage(phase, make_assessment(2))
+
+    content = phase.read_bytes()
+    assert b"\r" not in content
+    assert b"old" not in content
+    assert content.endswith(b"\n## Notes\nkeep me\n")
+
+
+def test_update_current_phase_skips_invalid_utf8(tmp_path: Path) -> None:
+    phase = tmp_path / "01-current-phase.md"
+    phase.write_bytes(b"# Phase \xff\n")
+
+    assert not update_current_phase_with_stage(phase, make_assessment(2))
+    assert phase.read_bytes() == b"# Phase \xff\n"
+
+
+def test_detect_project_stage_reuses_cached_metrics(
+    tmp_path: Path, monkeypatch
+) -> None:
+    module = tmp_path / "app.py"
+    module.write_text("print('hi')\n", encoding="utf-8")
+    cache = tmp_path / "stage_cache.json"
+
+    first = detect_project_stage(tmp_path, cache_path=cache)
+    assert first is not None and first.metrics.lines_of_code == 1
+    assert cache.exists()
+
+    def fail(*args, **kwargs):  # pragma: no cover - must not run on a cache hit
+        raise AssertionError("metrics were recollected")
+
+    monkeypatch.setattr(stage_update, "collect_metrics", fail)
+    cached = detect_project_stage(tmp_path, cache_path=cache)
+    assert cached is not None and cached.metrics == first.metrics
+
+    monkeypatch.undo()
+    module.write_text("print('hi')\nprint('again')\n", encoding="utf-8")
+    updated = detect_project_stage(tmp_path, cache_path=cache)
+    assert updated is not None and updated.metrics.lines_of_code == 2
@@ -0,0 +1,189 @@
+from pathlib import Path
+
+from code_map import uml_graph
+from code_map.events import ChangeBatch
+from code_map.uml_graph import UMLModelIndex, build_uml_model
+
+
+def write_module(tmp_path: Path, relative: str, content: str) -> Path:
+    target = tmp_path / relative
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(content.strip() + "\n", encoding="utf-8")
+    return target
+
+
+def classes_by_id(model):
+    return {cls["id"]: cls for cls in model["classes"]}
+
+
+def test_build_uml_model_deduplicates_associations(tmp_path: Path) -> None:
+    write_module(
+        tmp_path,
+        "pkg/models.py",
+        """
+from typing import List, Optional
+
+
+class Address:
+    street: str
+
+
+class User:
+    home: Address
+    work: Address
+    previous: List[Address]
+    spare: Optional[Address]
+""",
+    )
+
+    model = build_uml_model(tmp_path)
+    classes = classes_by_id(model)
+
+    user = classes["pkg.models.User"]
+    assert user["associations"] == ["pkg.models.Address"]
+    assert user["references"] == ["pkg.models.Address"]
+    assert model["stats"]["classes"] == 2
+
+
+def test_build_uml_model_reuses_cached_modules(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.delenv("CODE_MAP_CACHE_DIR", raising=False)
+    source = write_module(
+        tmp_path,
+        "pkg/shapes.py",
+        """
+class Shape:
+    def area(self) -> float:
+        return 0.0
+
+
+class Square(Shape):
+    side: float
+""",
+    )
+    first = build_uml_model(tmp_path)
+    cache_dir = tmp_path / ".code-map" / "uml"
+    assert len(list(cache_dir.glob("*.json"))) == 1
+
+    class ExplodingAnalyzer(uml_graph.UMLModuleAnalyzer):
+        def analyze(self, tree):  # pragma: no cover - must not run on a cache hit
+            raise AssertionError("cached module was re-analyzed")
+
+    monkeypatch.setattr(uml_graph, "UMLModuleAnalyzer", ExplodingAnalyzer)
+    assert build_uml_model(tmp_path) == first
+
+    monkeypatch.undo()
+    source.write_text(
+        source.read_text(encoding="utf-8") + "\n\nclass Circle(Shape):\n    pass\n",
+        encoding="utf-8",
+    )
+    updated = build_uml_model(tmp_path)
+    assert "pkg.shapes.Circle" in classes_by_id(updated)
+    assert len(list(cache_dir.glob("*.json"))) == 2
+
+
+def test_build_uml_model_without_cache_writes_nothing(tmp_path: Path) -> None:
+    write_module(tmp_path, "pkg/a.py", "class A:\n    pass")
+    build_uml_model(tmp_path, use_cache=False)
+    assert not (tmp_path / ".code-map").exists()
+
+
+def test_uml_analyzer_reads_members_from_class_body(tmp_path: Path) -> None:
+    write_module(
+        tmp_path,
+        "pkg/service.py",
+        """
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pkg.repo import Repository
+
+try:
+    from pkg.cache import Cache
+except ImportError:  # pragma: no cover
+    Cache = None
+
+
+class Service:
+    repo: "Repository"
+    limit = 10
+
+    def run(self, count: int) -> None:
+        scratch = Cache()
+        return scratch
+
+    class Config:
+        debug: bool
+""",
+    )
+    write_module(tmp_path, "pkg/repo.py", "class Repository:\n    pass")
+    write_module(tmp_path, "pkg/cache.py", "class Cache:\n    pass")
+
+    classes = classes_by_id(build_uml_model(tmp_path, use_cache=False))
+    service = classes["pkg.service.Service"]
+
+    assert [attr["name"] for attr in service["attributes"]] == ["repo", "limit"]
+    assert [method["name"] for method in service["methods"]] == ["run"]
+    assert service["methods"][0]["parameters"] == ["count"]
+    assert service["references"] == ["pkg.repo.Repository"]
+    assert service["instantiates"] == ["pkg.cache.Cache"]
+    assert [attr["name"] for attr in classes["pkg.service.Config"]["attributes"]] == [
+        "debug"
+    ]
+
+
+def test_render_uml_svg_prefers_pygraphviz_when_available(monkeypatch) -> None:
+    rendered = {}
+
+    class FakeAGraph:
+        def __init__(self, string: str) -> None:
+            rendered["dot"] = string
+
+        def draw(self, format: str, prog: str) -> bytes:
+            rendered["args"] = (format, prog)
+            return b"<svg/>"
+
+    class FakeModule:
+        AGraph = FakeAGraph
+
+    monkeypatch.setattr(
+        uml_graph.optional_dependencies,
+        "require",
+        lambda key, module=None: FakeModule if key == "pygraphviz" else None,
+    )
+    monkeypatch.setattr(
+        uml_graph, "_render_with_dot_binary", lambda dot, engine: "unexpected"
+    )
+
+    model = {"classes": [{"id": "pkg.A", "name": "A", "module": "pkg"}]}
+    assert uml_graph.render_uml_svg(model) == "<svg/>"
+    assert rendered["args"] == ("svg", "dot")
+    assert rendered["dot"].startswith("digraph UML {")
+
+
+def test_uml_model_index_applies_change_batches(tmp_path: Path) -> None:
+    base = write_module(tmp_path, "pkg/base.py", "class Base:\n    pass")
+    child = write_module(
+        tmp_path,
+        "pkg/child.py",
+        "from pkg.base import Base\n\n\nclass Child(Base):\n    pass",
+    )
+    index = UMLModelIndex(tmp_path, use_cache=False)
+    assert set(classes_by_id(index.build())) == {"pkg.base.Base", "pkg.child.Child"}
+
+    child.write_text(
+        "from pkg.base import Base\n\n\nclass Renamed(Base):\n    pass\n",
+        encoding="utf-8",
+    )
+    extra = write_module(tmp_path, "pkg/extra.py", "class Extra:\n    pass")
+    ignored = write_module(tmp_path, "build/gen.py", "class Generated:\n    pass")
+    assert index.apply_change_batch(
+        ChangeBatch(modified=[child], created=[extra, ignored])
+    )
+    classes = classes_by_id(index.build())
+    assert set(classes) == {"pkg.base.Base", "pkg.child.Renamed", "pkg.extra.Extra"}
+    assert classes["pkg.child.Renamed"]["bases"] == ["pkg.base.Base"]
+
+    base.unlink()
+    assert index.apply_change_batch(ChangeBatch(deleted=[base]))
+    classes = classes_by_id(index.build())
+    assert classes["pkg.child.Renamed"]["bases"] == []
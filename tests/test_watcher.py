@@ -0,0 +1,110 @@
+import os
+from pathlib import Path
+from types import SimpleNamespace
+
+from code_map.events import ChangeEventType
+from code_map.watcher import EXCLUDED_DEFAULT, _EventHandler
+
+
+class RecordingScheduler:
+    def __init__(self) -> None:
+        self.events = []
+
+    def enqueue(self, event_type, src_path, *, dest_path=None) -> None:
+        self.events.append((event_type, src_path, dest_path))
+
+
+def make_handler(root: Path) -> tuple[_EventHandler, RecordingScheduler]:
+    scheduler = RecordingScheduler()
+    handler = _EventHandler(root, scheduler, set(EXCLUDED_DEFAULT), {".py"})
+    return handler, scheduler
+
+
+def file_event(src: Path, dest: Path | None = None) -> SimpleNamespace:
+    return SimpleNamespace(
+        src_path=str(src),
+        dest_path=str(dest) if dest else None,
+        is_directory=False,
+    )
+
+
+def test_event_handler_filters_by_root_extension_and_exclusions(tmp_path: Path) -> None:
+    root = tmp_path.resolve()
+    handler, scheduler = make_handler(root)
+
+    handler.on_modified(file_event(root / "pkg" / "module.py"))
+    handler.on_modified(file_event(root / "pkg" / "README.md"))
+    handler.on_modified(file_event(root / ".venv" / "lib" / "site.py"))
+    handler.on_modified(file_event(root / "pkg" / "__pycache__" / "mod.py"))
+    handler.on_modified(file_event(root.parent / "outside.py"))
+    # Deleted files no longer exist on disk and must still be reported.
+    handler.on_deleted(file_event(root / "gone.PY"))
+
+    assert scheduler.events == [
+        (ChangeEventType.MODIFIED, root / "pkg" / "module.py", None),
+        (ChangeEventType.DELETED, root / "gone.PY", None),
+    ]
+
+
+def test_event_handler_allows_dotted_directories_above_root(tmp_path: Path) -> None:
+    root = (tmp_path / ".workspace" / "project").resolve()
+    handler, scheduler = make_handler(root)
+
+    handler.on_created(file_event(root / "app.py"))
+
+    assert scheduler.events == [(ChangeEventType.CREATED, root / "app.py", None)]
+
+
+def test_event_handler_drops_untracked_move_destination(tmp_path: Path) -> None:
+    root = tmp_path.resolve()
+    handler, scheduler = make_handler(root)
+
+    handler.on_moved(file_event(root / "a.py", root / "node_modules" / "a.py"))
+    handler.on_moved(file_event(root / "b.py", root / "c.py"))
+
+    assert scheduler.events == [
+        (ChangeEventType.MOVED, root / "a.py", None),
+        (ChangeEventType.MOVED, root / "b.py", root / "c.py"),
+    ]
+
+
+def test_event_handler_drops_repeated_modified_events(tmp_path: Path) -> None:
+    root = tmp_path.resolve()
+    handler, scheduler = make_handler(root)
+    module = root / "module.py"
+    module.write_text("x = 1\n", encoding="utf-8")
+
+    handler.on_modified(file_event(module))
+    handler.on_modified(file_event(module))
+    stat = module.stat()
+    os.utime(module, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    handler.on_modified(file_event(module))
+
+    assert scheduler.events == [
+        (ChangeEventType.MODIFIED, module, None),
+        (ChangeEventType.MODIFIED, module, None),
+    ]
+
+
+def test_event_handler_keeps_saves_with_unchanged_mtime(tmp_path: Path) -> None:
+    root = tmp_path.resolve()
+    handler, scheduler = make_handler(root)
+    module = root / "module.py"
+    module.write_text("x = 1\n", encoding="utf-8")
+    stat = module.stat()
+    frozen = (stat.st_atime_ns, stat.st_mtime_ns)
+    handler.on_modified(file_event(module))
+
+    # Coarse timestamps: a second save within the same tick keeps the mtime.
+    module.write_text("x = 10\n", encoding="utf-8")
+    os.utime(module, ns=frozen)
+    handler.on_modified(file_event(module))
+
+    # Atomic save of a same-size file: only the inode changes.
+    replacement = root / "module.py.tmp"
+    replacement.write_text("x = 20\n", encoding="utf-8")
+    os.utime(replacement, ns=frozen)
+    os.replace(replacement, module)
+    handler.on_modified(file_event(module))
+
+    assert scheduler.events == [(ChangeEventType.MODIFIED, module, None)] * 3